@@ -1,3 +1,7 @@
+from .feed import router as feed_router  # noqa
+from .follow import router as follow_router  # noqa
+from .internal import router as internal_router  # noqa
 from .like import router as like_router  # noqa
 from .post import router as post_router  # noqa
+from .stream import router as stream_router  # noqa
 from .user import router as user_router  # noqa
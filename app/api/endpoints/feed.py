@@ -0,0 +1,53 @@
+from http import HTTPStatus
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import validators
+from app.core.crud.post import post_crud
+from app.core.db.db import get_async_read_session
+from app.core.db.models import User
+from app.core.error import generate_error_responses
+from app.core.instrumentation import InstrumentedRoute
+from app.core.pagination import get_next_cursor
+from app.core.serialization import (
+    render_response,
+    serialize_page,
+    serialize_post_detail,
+)
+from app.core.user import current_user
+from app.schemas.post import PostDetailPage
+
+router = APIRouter(route_class=InstrumentedRoute)
+
+
+@router.get(
+    "",
+    response_model=PostDetailPage,
+    status_code=HTTPStatus.OK,
+    responses=generate_error_responses(HTTPStatus.BAD_REQUEST, HTTPStatus.UNAUTHORIZED),
+)
+async def get_feed(
+    limit: int = Query(default=10, gt=0),
+    cursor: Optional[str] = Query(default=None),
+    session: AsyncSession = Depends(get_async_read_session),
+    user: User = Depends(current_user),
+):
+    """
+    Получить ленту постов пользователей, на которых подписан текущий
+    пользователь, начиная с самых новых.
+
+    - **limit**: Ограничение количества постов в ответе (по умолчанию 10).
+    - **cursor**: Курсор следующей страницы из поля `next_cursor` (опционально).
+    - **session**: Асинхронная сессия для работы с базой данных.
+    - **user**: Текущий пользователь.
+
+    """
+    decoded_cursor = await validators.check_cursor(cursor)
+    posts = await post_crud.get_timeline_rows(user.id, limit, session, decoded_cursor)
+    return render_response(
+        serialize_page(
+            PostDetailPage, posts, get_next_cursor(posts, limit), serialize_post_detail
+        )
+    )
@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import validators
+from app.core.crud.follow import follow_crud
+from app.core.db.db import get_async_session
+from app.core.db.models import User
+from app.core.error import generate_error_responses
+from app.core.instrumentation import InstrumentedRoute
+from app.core.user import current_user
+from app.schemas.follow import FollowDB
+
+router = APIRouter(route_class=InstrumentedRoute)
+
+
+@router.post(
+    "/{user_id}",
+    response_model=FollowDB,
+    status_code=HTTPStatus.CREATED,
+    responses=generate_error_responses(
+        HTTPStatus.NOT_FOUND, HTTPStatus.BAD_REQUEST, HTTPStatus.UNAUTHORIZED
+    ),
+)
+async def follow_user(
+    user_id: int,
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_user),
+):
+    """
+    Подписаться на пользователя.
+
+    Последние посты пользователя сразу появляются в ленте подписчика.
+
+    - **user_id**: Идентификатор пользователя.
+    - **session**: Асинхронная сессия для работы с базой данных.
+    - **user**: Текущий пользователь.
+
+    """
+    current_user_id = user.id
+    new_follow = await follow_crud.follow(user, user_id, session)
+    if new_follow is None:
+        await validators.check_user_exists(user_id, session)
+        await validators.check_follow_self(user_id, current_user_id)
+    await validators.checking_follow_exists_to_follow(new_follow)
+    return new_follow
+
+
+@router.delete(
+    "/{user_id}",
+    response_model=FollowDB,
+    status_code=HTTPStatus.OK,
+    responses=generate_error_responses(HTTPStatus.BAD_REQUEST, HTTPStatus.UNAUTHORIZED),
+)
+async def unfollow_user(
+    user_id: int,
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_user),
+):
+    """
+    Отписаться от пользователя.
+
+    - **user_id**: Идентификатор пользователя.
+    - **session**: Асинхронная сессия для работы с базой данных.
+    - **user**: Текущий пользователь.
+
+    """
+    deleted_follow = await follow_crud.unfollow(user, user_id, session)
+    await validators.checking_follow_exists_to_unfollow(deleted_follow)
+    return deleted_follow
@@ -0,0 +1,54 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.core.db.db import engine, replica_router
+from app.core.error import generate_error_responses
+from app.core.instrumentation import InstrumentedRoute, request_metrics
+from app.core.singleflight import render_single_flight_metrics
+from app.core.user import current_superuser
+from app.schemas.internal import PoolStatsDB
+
+router = APIRouter(
+    route_class=InstrumentedRoute, dependencies=[Depends(current_superuser)]
+)
+
+
+@router.get(
+    "/db/pool",
+    response_model=dict[str, PoolStatsDB],
+    status_code=HTTPStatus.OK,
+    responses=generate_error_responses(HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN),
+)
+async def get_db_pool_stats():
+    """
+    Получить состояние пулов соединений текущего процесса.
+
+    Статистика собирается отдельно в каждом воркере gunicorn.
+
+    """
+    stats = {"primary": engine.pool.stats()}
+    for replica in replica_router.replicas:
+        stats[replica.name] = replica.engine.pool.stats()
+    return stats
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    status_code=HTTPStatus.OK,
+    responses=generate_error_responses(HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN),
+)
+async def get_request_metrics():
+    """
+    Получить метрики запросов текущего процесса в формате Prometheus.
+
+    Метрики маршрутов собираются, если включена настройка
+    REQUEST_METRICS_ENABLED; счетчики объединенных запросов - всегда.
+
+    """
+    return PlainTextResponse(
+        request_metrics.render() + render_single_flight_metrics(),
+        media_type="text/plain; version=0.0.4",
+    )
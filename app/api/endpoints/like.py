@@ -1,50 +1,113 @@
 from http import HTTPStatus
+from typing import Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import validators
 from app.core.crud.like import like_crud
-from app.core.crud.user import user_crud
-from app.core.db.db import get_async_session
+from app.core.db.db import get_async_read_session, get_async_session
 from app.core.db.models import User
 from app.core.error import generate_error_responses
+from app.core.instrumentation import InstrumentedRoute
+from app.core.pagination import get_next_cursor
+from app.core.ratelimit import limit_by_user
+from app.core.serialization import (
+    render_response,
+    serialize_like_detail,
+    serialize_page,
+)
 from app.core.user import current_user
-from app.schemas.like import LikeDB, LikeDetailDB
+from app.schemas.bulk import BulkItemResult, BulkResult
+from app.schemas.like import LikeBulkCreate, LikeDB, LikeDetailPage
 
-router = APIRouter()
+router = APIRouter(route_class=InstrumentedRoute)
 
 
 @router.get(
     "/{post_id}",
-    response_model=list[LikeDetailDB],
+    response_model=LikeDetailPage,
     status_code=HTTPStatus.OK,
-    responses=generate_error_responses(HTTPStatus.NOT_FOUND),
+    responses=generate_error_responses(HTTPStatus.NOT_FOUND, HTTPStatus.BAD_REQUEST),
 )
 async def get_all_posts_likes(
     post_id: int,
-    session: AsyncSession = Depends(get_async_session),
+    limit: int = Query(default=10, gt=0),
+    cursor: Optional[str] = Query(default=None),
+    session: AsyncSession = Depends(get_async_read_session),
 ):
     """
-    Получить все лайки поста.
+    Получить лайки поста, начиная с самых новых.
 
     - **post_id**: Идентификатор поста.
+    - **limit**: Ограничение количества лайков в ответе (по умолчанию 10).
+    - **cursor**: Курсор следующей страницы из поля `next_cursor` (опционально).
+    - **session**: Асинхронная сессия для работы с базой данных.
+
+    """
+    decoded_cursor = await validators.check_cursor(cursor)
+    await validators.check_post_exists(post_id, session)
+    likes = await like_crud.get_post_likes(post_id, limit, session, decoded_cursor)
+    return render_response(
+        serialize_page(
+            LikeDetailPage, likes, get_next_cursor(likes, limit), serialize_like_detail
+        )
+    )
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkResult,
+    status_code=HTTPStatus.OK,
+    dependencies=[Depends(limit_by_user("likes"))],
+    responses=generate_error_responses(
+        HTTPStatus.UNAUTHORIZED, HTTPStatus.TOO_MANY_REQUESTS
+    ),
+)
+async def leave_likes(
+    post_ids: LikeBulkCreate,
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_user),
+):
+    """
+    Поставить лайки на несколько постов за один запрос.
+
+    Лайки вставляются пачками, каждая пачка фиксируется отдельной транзакцией.
+    Для каждого поста возвращается идентификатор лайка или причина ошибки.
+
+    - **post_ids**: Идентификаторы постов.
     - **session**: Асинхронная сессия для работы с базой данных.
+    - **user**: Текущий пользователь.
 
     """
-    post = await validators.check_post_with_likes_exists(post_id, session)
-    for like in post.likes:
-        user = await user_crud.get(like.author_id, session)
-        setattr(like, "author", user)
-    return post.likes
+    user_id = user.id
+    new_likes = await like_crud.leave_likes(user, post_ids.items, session)
+    errors = await validators.get_bulk_like_errors(
+        post_ids.items, new_likes, user_id, session
+    )
+    return BulkResult(
+        created=len(new_likes),
+        items=[
+            BulkItemResult(
+                index=index,
+                id=new_likes[post_id] if error is None else None,
+                error=error,
+            )
+            for index, (post_id, error) in enumerate(zip(post_ids.items, errors))
+        ],
+    )
 
 
 @router.post(
     "/{post_id}",
     response_model=LikeDB,
     status_code=HTTPStatus.CREATED,
+    dependencies=[Depends(limit_by_user("likes"))],
     responses=generate_error_responses(
-        HTTPStatus.NOT_FOUND, HTTPStatus.BAD_REQUEST, HTTPStatus.UNAUTHORIZED
+        HTTPStatus.NOT_FOUND,
+        HTTPStatus.BAD_REQUEST,
+        HTTPStatus.UNAUTHORIZED,
+        HTTPStatus.TOO_MANY_REQUESTS,
     ),
 )
 async def leave_like(
@@ -60,11 +123,11 @@ async def leave_like(
     - **user**: Текущий пользователь.
 
     """
-    post = await validators.check_post_with_likes_exists(post_id, session)
-    await validators.check_post_author_for_like(post.author_id, user.id)
-    user_like = next((like for like in post.likes if like.author_id == user.id), None)
-    await validators.checking_like_exists_to_leave(user_like)
-    new_like = await like_crud.leave_like(user, post, session)
+    new_like = await like_crud.leave_like(user, post_id, session)
+    if new_like is None:
+        post = await validators.check_post_exists(post_id, session)
+        await validators.check_post_author_for_like(post.author_id, user.id)
+    await validators.checking_like_exists_to_leave(new_like)
     return new_like
 
 
@@ -89,7 +152,8 @@ async def delete_like(
     - **user**: Текущий пользователь.
 
     """
-    post = await validators.check_post_with_likes_exists(post_id, session)
-    user_like = next((like for like in post.likes if like.author_id == user.id), None)
-    await validators.checking_like_exists_to_delete(user_like)
-    return await like_crud.delete(user_like, session)
+    deleted_like = await like_crud.delete_like(user, post_id, session)
+    if deleted_like is None:
+        await validators.check_post_exists(post_id, session)
+    await validators.checking_like_exists_to_delete(deleted_like)
+    return deleted_like
@@ -1,41 +1,174 @@
 from http import HTTPStatus
+from typing import Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import validators
+from app.core.cache import (
+    FEED_TAG,
+    cache_response,
+    get_cached_response,
+    make_cache_key,
+    post_tag,
+)
+from app.core.config import settings
+from app.core.crud.like import like_crud
 from app.core.crud.post import post_crud
-from app.core.db.db import get_async_session
+from app.core.db.db import get_async_read_session, get_async_session, reads_from_primary
 from app.core.db.models import User
 from app.core.error import generate_error_responses
-from app.core.user import current_user
-from app.schemas.post import PostCreate, PostDB, PostDetailDB, PostUpdate
+from app.core.instrumentation import InstrumentedRoute
+from app.core.pagination import get_next_cursor, get_next_rank_cursor
+from app.core.ratelimit import limit_by_user
+from app.core.serialization import (
+    render_response,
+    serialize_object,
+    serialize_page,
+    serialize_post_detail,
+    serialize_post_feed,
+)
+from app.core.user import current_user, optional_current_user
+from app.schemas.bulk import BulkItemResult, BulkResult
+from app.schemas.post import (
+    PostBulkCreate,
+    PostCreate,
+    PostDB,
+    PostDetailDB,
+    PostDetailPage,
+    PostFeedPage,
+    PostUpdate,
+)
 
-router = APIRouter()
+router = APIRouter(route_class=InstrumentedRoute)
 
 
 @router.get(
     "/",
-    response_model=list[PostDetailDB],
+    response_model=PostFeedPage,
     status_code=HTTPStatus.OK,
+    responses=generate_error_responses(HTTPStatus.BAD_REQUEST),
 )
 async def get_all_posts(
+    request: Request,
     limit: int = Query(default=10, gt=0),
     offset: int = Query(default=0, ge=0),
-    session: AsyncSession = Depends(get_async_session),
+    cursor: Optional[str] = Query(default=None),
+    session: AsyncSession = Depends(get_async_read_session),
+    user: Optional[User] = Depends(optional_current_user),
 ):
     """
-    Получить все посты.
+    Получить все посты, начиная с самых новых.
 
     - **limit**: Ограничение количества постов в ответе (по умолчанию 10).
     - **offset**: Смещение начала списка постов (по умолчанию 0).
+    - **cursor**: Курсор следующей страницы из поля `next_cursor` (опционально).
+    Стоимость запроса по курсору не зависит от глубины страницы,
+    поэтому он предпочтительнее смещения.
     - **session**: Асинхронная сессия для работы с базой данных.
+    - **user**: Текущий пользователь (опционально). Для авторизованного
+    пользователя в поле `liked_by_me` отмечены посты, на которые он поставил лайк;
+    для анонимного запроса поле пустое. Ответы авторизованным пользователям
+    не кэшируются.
 
     """
-    posts = await post_crud.get_all_posts(limit, offset, session)
-    for post in posts:
-        setattr(post, "likes_count", len(post.likes))
-    return posts
+    if user is None:
+        cache_key = make_cache_key(
+            "posts:list", limit=limit, offset=offset, cursor=cursor
+        )
+        cached_response = await get_cached_response(request, cache_key)
+        if cached_response is not None:
+            return cached_response
+    decoded_cursor = await validators.check_cursor(cursor)
+    posts = await post_crud.get_all_post_rows(limit, offset, session, decoded_cursor)
+    if user is not None:
+        liked_post_ids = await like_crud.get_liked_post_ids(
+            user.id, [post.id for post in posts], session
+        )
+        for post in posts:
+            post.liked_by_me = post.id in liked_post_ids
+    page = serialize_page(
+        PostFeedPage, posts, get_next_cursor(posts, limit), serialize_post_feed
+    )
+    if user is not None:
+        return render_response(page)
+    tags = [post_tag(post.id) for post in posts]
+    if cursor is None:
+        tags.append(FEED_TAG)
+    return await cache_response(cache_key, page, tags, session)
+
+
+@router.get(
+    "/trending",
+    response_model=PostDetailPage,
+    status_code=HTTPStatus.OK,
+)
+async def get_trending_posts(
+    request: Request,
+    limit: int = Query(default=10, gt=0, le=settings.TRENDING_MAX_LIMIT),
+    session: AsyncSession = Depends(get_async_read_session),
+):
+    """
+    Получить самые популярные посты.
+
+    Посты упорядочены по количеству лайков, в котором вес каждого лайка
+    уменьшается вдвое за период TRENDING_HALF_LIFE_HOURS. Ответ содержит
+    одну страницу, поле `next_cursor` всегда пустое.
+
+    - **limit**: Количество постов в ответе (по умолчанию 10).
+    - **session**: Асинхронная сессия для работы с базой данных.
+
+    """
+    cache_key = make_cache_key("posts:trending", limit=limit)
+    cached_response = await get_cached_response(request, cache_key)
+    if cached_response is not None:
+        return cached_response
+    posts = await post_crud.get_trending_rows(limit, session)
+    page = serialize_page(PostDetailPage, posts, None, serialize_post_detail)
+    return await cache_response(
+        cache_key, page, [post_tag(post.id) for post in posts], session
+    )
+
+
+@router.get(
+    "/search",
+    response_model=PostDetailPage,
+    status_code=HTTPStatus.OK,
+    responses=generate_error_responses(HTTPStatus.BAD_REQUEST),
+)
+async def search_posts(
+    request: Request,
+    q: str = Query(min_length=1),
+    limit: int = Query(default=10, gt=0),
+    cursor: Optional[str] = Query(default=None),
+    session: AsyncSession = Depends(get_async_read_session),
+):
+    """
+    Найти посты по тексту, начиная с самых релевантных.
+
+    - **q**: Поисковый запрос. Слова ищутся с учетом словоформ, поддерживаются
+    фразы в кавычках, `or` и исключение слов через `-`.
+    - **limit**: Ограничение количества постов в ответе (по умолчанию 10).
+    - **cursor**: Курсор следующей страницы из поля `next_cursor` (опционально).
+    - **session**: Асинхронная сессия для работы с базой данных.
+
+    """
+    cache_key = make_cache_key("posts:search", q=q, limit=limit, cursor=cursor)
+    cached_response = await get_cached_response(request, cache_key)
+    if cached_response is not None:
+        return cached_response
+    decoded_cursor = await validators.check_rank_cursor(cursor)
+    posts = await post_crud.search_post_rows(q, limit, session, decoded_cursor)
+    page = serialize_page(
+        PostDetailPage,
+        posts,
+        get_next_rank_cursor(posts, limit),
+        serialize_post_detail,
+    )
+    tags = [post_tag(post.id) for post in posts]
+    if cursor is None:
+        tags.append(FEED_TAG)
+    return await cache_response(cache_key, page, tags, session)
 
 
 @router.get(
@@ -45,8 +178,9 @@ async def get_all_posts(
     responses=generate_error_responses(HTTPStatus.NOT_FOUND),
 )
 async def get_post_by_id(
+    request: Request,
     post_id: int,
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_async_read_session),
 ):
     """
     Получить пост по его идентификатору.
@@ -55,16 +189,29 @@ async def get_post_by_id(
     - **session**: Асинхронная сессия для работы с базой данных.
 
     """
-    post = await validators.check_post_with_author_and_likes_exists(post_id, session)
-    setattr(post, "likes_count", len(post.likes))
-    return post
+    cache_key = make_cache_key("posts:detail", post_id=post_id)
+    cached_response = await get_cached_response(request, cache_key)
+    if cached_response is not None:
+        return cached_response
+    post = await validators.check_post_with_author_exists(
+        post_id, session, coalesce=not reads_from_primary(request)
+    )
+    return await cache_response(
+        cache_key,
+        serialize_object(PostDetailDB, post, serialize_post_detail),
+        [post_tag(post_id)],
+        session,
+    )
 
 
 @router.post(
     "/",
     response_model=PostDB,
     status_code=HTTPStatus.CREATED,
-    responses=generate_error_responses(HTTPStatus.BAD_REQUEST, HTTPStatus.UNAUTHORIZED),
+    dependencies=[Depends(limit_by_user("posts"))],
+    responses=generate_error_responses(
+        HTTPStatus.BAD_REQUEST, HTTPStatus.UNAUTHORIZED, HTTPStatus.TOO_MANY_REQUESTS
+    ),
 )
 async def create_new_post(
     post: PostCreate,
@@ -80,8 +227,46 @@ async def create_new_post(
 
     """
     await validators.check_text_duplicate(post.text, session)
-    new_post = await post_crud.create(post, session, user)
-    return new_post
+    return await post_crud.create(post, session, user)
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkResult,
+    status_code=HTTPStatus.OK,
+    dependencies=[Depends(limit_by_user("posts"))],
+    responses=generate_error_responses(
+        HTTPStatus.UNAUTHORIZED, HTTPStatus.TOO_MANY_REQUESTS
+    ),
+)
+async def create_new_posts(
+    posts: PostBulkCreate,
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_user),
+):
+    """
+    Создать несколько постов за один запрос.
+
+    Посты вставляются пачками, каждая пачка фиксируется отдельной транзакцией.
+    Для каждого поста возвращается его идентификатор или причина ошибки.
+
+    - **posts**: Данные для создания постов.
+    - **session**: Асинхронная сессия для работы с базой данных.
+    - **user**: Текущий пользователь.
+
+    """
+    post_ids = await post_crud.create_posts(posts.items, session, user)
+    return BulkResult(
+        created=sum(post_id is not None for post_id in post_ids),
+        items=[
+            BulkItemResult(
+                index=index,
+                id=post_id,
+                error=validators.POST_DUPLICATE if post_id is None else None,
+            )
+            for index, post_id in enumerate(post_ids)
+        ],
+    )
 
 
 @router.patch(
@@ -0,0 +1,155 @@
+import asyncio
+from http import HTTPStatus
+from typing import AsyncIterator
+
+import orjson
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+
+from app.api import validators
+from app.core.config import settings
+from app.core.error import generate_error_responses
+from app.core.stream import FEED_TOPIC, Subscriber, get_topics, stream_hub
+from app.schemas.stream import StreamCommand
+
+router = APIRouter()
+
+
+async def iterate_events(topics: list[str]) -> AsyncIterator[bytes]:
+    """
+    Подписывается на темы и выдает пачки изменений в формате Server-Sent Events.
+
+    Если изменений нет, периодически выдает комментарий, чтобы прокси
+    не закрывали соединение. Подписка удаляется при отключении клиента.
+
+    - **topics**: Темы подписки.
+
+    """
+    subscriber = Subscriber()
+    stream_hub.subscribe(subscriber, topics)
+    try:
+        yield b": connected\n\n"
+        while True:
+            batch = await subscriber.next_batch(settings.STREAM_HEARTBEAT_SECONDS)
+            if batch is None:
+                yield b": ping\n\n"
+            else:
+                yield b"data: " + orjson.dumps(batch) + b"\n\n"
+    finally:
+        stream_hub.unsubscribe(subscriber)
+
+
+@router.get(
+    "",
+    response_class=StreamingResponse,
+    status_code=HTTPStatus.OK,
+    responses=generate_error_responses(HTTPStatus.BAD_REQUEST),
+)
+async def stream_events(
+    posts: list[int] = Query(default=[]),
+    feed: bool = Query(default=False),
+):
+    """
+    Получать изменения постов в формате Server-Sent Events.
+
+    Каждое событие - пачка изменений за STREAM_BATCH_SECONDS: изменения
+    количества лайков постов `likes` и идентификаторы новых постов `posts`.
+    Флаг `posts_overflow` означает, что часть новых постов не поместилась
+    в пачку и ленту нужно перечитать.
+
+    - **posts**: Идентификаторы постов для отслеживания лайков.
+    - **feed**: Получать ли новые посты (по умолчанию нет).
+
+    """
+    await validators.check_stream_topics(posts, feed)
+    return StreamingResponse(
+        iterate_events(get_topics(posts, feed)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def send_events(websocket: WebSocket, subscriber: Subscriber) -> None:
+    """
+    Отправляет клиенту пачки изменений, пока соединение открыто.
+
+    - **websocket**: Соединение WebSocket.
+    - **subscriber**: Подписка соединения.
+
+    """
+    while True:
+        batch = await subscriber.next_batch(settings.STREAM_HEARTBEAT_SECONDS)
+        if batch is not None:
+            await websocket.send_bytes(orjson.dumps(batch))
+
+
+async def receive_commands(websocket: WebSocket, subscriber: Subscriber) -> None:
+    """
+    Изменяет подписки соединения по командам клиента, пока соединение открыто.
+
+    На недопустимую команду клиент получает сообщение с полем `error`.
+
+    - **websocket**: Соединение WebSocket.
+    - **subscriber**: Подписка соединения.
+
+    """
+    while True:
+        try:
+            command = StreamCommand.parse_raw(await websocket.receive_text())
+        except ValidationError as error:
+            await websocket.send_json({"error": error.errors()})
+            continue
+        topics = get_topics(command.posts, command.feed)
+        if command.action == "unsubscribe":
+            stream_hub.unsubscribe(subscriber, topics)
+            continue
+        topics = subscriber.topics | set(topics)
+        error = validators.get_stream_topics_error(
+            [topic for topic in topics if topic != FEED_TOPIC],
+            FEED_TOPIC in topics,
+        )
+        if error is not None:
+            await websocket.send_json({"error": error})
+            continue
+        stream_hub.subscribe(subscriber, topics)
+
+
+@router.websocket("/ws")
+async def stream_events_ws(
+    websocket: WebSocket,
+    posts: list[int] = Query(default=[]),
+    feed: bool = Query(default=False),
+):
+    """
+    Получать изменения постов через WebSocket.
+
+    Сообщения сервера совпадают с событиями `/stream`. Клиент может изменять
+    подписки командами `{"action": "subscribe" | "unsubscribe",
+    "posts": [...], "feed": true}`.
+
+    - **websocket**: Соединение WebSocket.
+    - **posts**: Идентификаторы постов для отслеживания лайков.
+    - **feed**: Получать ли новые посты (по умолчанию нет).
+
+    """
+    if len(set(posts)) > settings.STREAM_MAX_POSTS:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+    subscriber = Subscriber()
+    stream_hub.subscribe(subscriber, get_topics(posts, feed))
+    tasks = [
+        asyncio.create_task(send_events(websocket, subscriber)),
+        asyncio.create_task(receive_commands(websocket, subscriber)),
+    ]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if not isinstance(task.exception(), WebSocketDisconnect):
+                task.result()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        stream_hub.unsubscribe(subscriber)
@@ -1,14 +1,21 @@
 from http import HTTPStatus
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 
+from app.core.error import generate_error_responses
+from app.core.ratelimit import limit_by_ip
 from app.core.user import auth_backend, fastapi_users
 from app.schemas.user import UserCreate, UserRead, UserUpdate
 
 router = APIRouter()
 
+auth_router = fastapi_users.get_auth_router(auth_backend)
+for route in auth_router.routes:
+    if route.path == "/login":
+        route.dependencies.append(Depends(limit_by_ip("login")))
+        route.responses.update(generate_error_responses(HTTPStatus.TOO_MANY_REQUESTS))
 router.include_router(
-    fastapi_users.get_auth_router(auth_backend),
+    auth_router,
     prefix="/auth/jwt",
     tags=["auth"],
 )
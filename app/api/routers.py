@@ -1,8 +1,20 @@
 from fastapi import APIRouter
 
-from app.api.endpoints import like_router, post_router, user_router
+from app.api.endpoints import (
+    feed_router,
+    follow_router,
+    internal_router,
+    like_router,
+    post_router,
+    stream_router,
+    user_router,
+)
 
 main_router = APIRouter()
 main_router.include_router(user_router)
 main_router.include_router(post_router, prefix="/posts", tags=["Post"])
 main_router.include_router(like_router, prefix="/likes", tags=["Like"])
+main_router.include_router(follow_router, prefix="/follows", tags=["Follow"])
+main_router.include_router(feed_router, prefix="/feed", tags=["Feed"])
+main_router.include_router(stream_router, prefix="/stream", tags=["Stream"])
+main_router.include_router(internal_router, prefix="/internal", tags=["Internal"])
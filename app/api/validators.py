@@ -1,11 +1,23 @@
+from datetime import datetime
 from http import HTTPStatus
 from typing import Optional
 
 from fastapi import HTTPException
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.crud.post import post_crud
+from app.core.crud.user import user_crud
 from app.core.db.models import Like
+from app.core.pagination import decode_cursor, decode_rank_cursor
+
+POST_NOT_FOUND = "Пост не найден!"
+POST_DUPLICATE = "Такой пост уже существует!"
+OWN_POST_LIKE = "Вы не можете поставить лайк на свой пост."
+LIKE_DUPLICATE = "Вы уже ставили лайк на этот пост."
+STREAM_NO_TOPICS = "Укажите посты или ленту для подписки."
+STREAM_TOO_MANY_POSTS = "Слишком много постов для подписки."
 
 
 async def check_post_exists(
@@ -21,41 +33,27 @@ async def check_post_exists(
     """
     post = await post_crud.get(post_id, session)
     if post is None:
-        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Пост не найден!")
-    return post
-
-
-async def check_post_with_likes_exists(
-    post_id: int,
-    session: AsyncSession,
-) -> None:
-    """
-    Проверяет существование поста с лайками.
-
-    - **post_id**: Идентификатор поста для проверки.
-    - **session**: Асинхронная сессия для работы с базой данных.
-
-    """
-    post = await post_crud.get_post_with_likes_by_id(post_id, session)
-    if post is None:
-        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Пост не найден!")
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail=POST_NOT_FOUND)
     return post
 
 
-async def check_post_with_author_and_likes_exists(
+async def check_post_with_author_exists(
     post_id: int,
     session: AsyncSession,
+    coalesce: bool = True,
 ) -> None:
     """
-    Проверяет существование поста с автором и лайками.
+    Проверяет существование поста с автором.
 
     - **post_id**: Идентификатор поста для проверки.
     - **session**: Асинхронная сессия для работы с базой данных.
+    - **coalesce**: Можно ли получить результат такого же одновременного
+    запроса (по умолчанию True).
 
     """
-    post = await post_crud.get_post_with_author_and_likes_by_id(post_id, session)
+    post = await post_crud.get_post_with_author_by_id(post_id, session, coalesce)
     if post is None:
-        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Пост не найден!")
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail=POST_NOT_FOUND)
     return post
 
 
@@ -70,11 +68,13 @@ async def check_text_duplicate(
     - **session**: Асинхронная сессия для работы с базой данных.
 
     """
+    if text is None:
+        return
     post = await post_crud.get_post_by_text(text, session)
     if post is not None:
         raise HTTPException(
             status_code=HTTPStatus.BAD_REQUEST,
-            detail="Такой пост уже существует!",
+            detail=POST_DUPLICATE,
         )
 
 
@@ -110,26 +110,60 @@ async def check_post_author_for_like(
     if author_id == user_id:
         raise HTTPException(
             status_code=HTTPStatus.BAD_REQUEST,
-            detail="Вы не можете поставить лайк на свой пост.",
+            detail=OWN_POST_LIKE,
         )
 
 
 async def checking_like_exists_to_leave(
-    user_like: Optional[Like | None],
+    new_like: Optional[Like | None],
 ) -> None:
     """
-    Проверяет ставил ли пользователь лайк на пост.
+    Проверяет, что лайк поставлен, а не отклонен как повторный.
 
-    - **user_like**: Лайк пользователя.
+    - **new_like**: Поставленный лайк или None, если лайк уже существовал.
 
     """
-    if user_like is not None:
+    if new_like is None:
         raise HTTPException(
             status_code=HTTPStatus.BAD_REQUEST,
-            detail="Вы уже ставили лайк на этот пост.",
+            detail=LIKE_DUPLICATE,
         )
 
 
+async def get_bulk_like_errors(
+    post_ids: list[int],
+    new_likes: dict[int, int],
+    user_id: int,
+    session: AsyncSession,
+) -> list[Optional[str]]:
+    """
+    Возвращает для каждого поста причину, по которой лайк не был поставлен,
+    или None, если лайк поставлен.
+
+    - **post_ids**: Идентификаторы постов в порядке запроса.
+    - **new_likes**: Поставленные лайки по идентификаторам постов.
+    - **user_id**: Идентификатор текущего пользователя.
+    - **session**: Асинхронная сессия для работы с базой данных.
+
+    """
+    skipped_post_ids = [post_id for post_id in post_ids if post_id not in new_likes]
+    post_authors = {}
+    if skipped_post_ids:
+        post_authors = await post_crud.get_post_authors(skipped_post_ids, session)
+    errors, seen_post_ids = [], set()
+    for post_id in post_ids:
+        if post_id in new_likes and post_id not in seen_post_ids:
+            errors.append(None)
+        elif post_id not in new_likes and post_id not in post_authors:
+            errors.append(POST_NOT_FOUND)
+        elif post_authors.get(post_id) == user_id:
+            errors.append(OWN_POST_LIKE)
+        else:
+            errors.append(LIKE_DUPLICATE)
+        seen_post_ids.add(post_id)
+    return errors
+
+
 async def checking_like_exists_to_delete(
     user_like: Optional[Like | None],
 ) -> None:
@@ -144,3 +178,141 @@ async def checking_like_exists_to_delete(
             status_code=HTTPStatus.BAD_REQUEST,
             detail="Вы не ставили лайк на этот пост.",
         )
+
+
+async def check_cursor(
+    cursor: Optional[str],
+) -> Optional[tuple[datetime, int]]:
+    """
+    Проверяет и декодирует курсор пагинации.
+
+    - **cursor**: Курсор, полученный в поле `next_cursor` (опционально).
+
+    """
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail="Некорректный курсор.",
+        )
+
+
+async def check_rank_cursor(
+    cursor: Optional[str],
+) -> Optional[tuple[float, int]]:
+    """
+    Проверяет и декодирует курсор списка, упорядоченного по релевантности.
+
+    - **cursor**: Курсор, полученный в поле `next_cursor` (опционально).
+
+    """
+    if cursor is None:
+        return None
+    try:
+        return decode_rank_cursor(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail="Некорректный курсор.",
+        )
+
+
+async def check_user_exists(
+    user_id: int,
+    session: AsyncSession,
+) -> None:
+    """
+    Проверяет существование пользователя.
+
+    - **user_id**: Идентификатор пользователя для проверки.
+    - **session**: Асинхронная сессия для работы с базой данных.
+
+    """
+    user = await user_crud.get(user_id, session)
+    if user is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail="Пользователь не найден!"
+        )
+    return user
+
+
+async def check_follow_self(
+    author_id: int,
+    user_id: int,
+) -> None:
+    """
+    Проверяет, что пользователь не подписывается на себя.
+
+    - **author_id**: Идентификатор автора.
+    - **user_id**: Идентификатор текущего пользователя.
+
+    """
+    if author_id == user_id:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail="Вы не можете подписаться на себя.",
+        )
+
+
+async def checking_follow_exists_to_follow(
+    new_follow: Optional[Row],
+) -> None:
+    """
+    Проверяет, что подписка создана, а не отклонена как повторная.
+
+    - **new_follow**: Созданная подписка или None, если она уже существовала.
+
+    """
+    if new_follow is None:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail="Вы уже подписаны на этого пользователя.",
+        )
+
+
+async def checking_follow_exists_to_unfollow(
+    deleted_follow: Optional[Row],
+) -> None:
+    """
+    Проверяет наличие подписки для удаления.
+
+    - **deleted_follow**: Удаленная подписка или None, если ее не было.
+
+    """
+    if deleted_follow is None:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail="Вы не подписаны на этого пользователя.",
+        )
+
+
+def get_stream_topics_error(post_ids: list[int], feed: bool) -> Optional[str]:
+    """
+    Возвращает причину, по которой подписка на поток недопустима,
+    или None, если подписка допустима.
+
+    - **post_ids**: Идентификаторы постов всех подписок соединения.
+    - **feed**: Подписано ли соединение на новые посты.
+
+    """
+    if not post_ids and not feed:
+        return STREAM_NO_TOPICS
+    if len(set(post_ids)) > settings.STREAM_MAX_POSTS:
+        return STREAM_TOO_MANY_POSTS
+    return None
+
+
+async def check_stream_topics(post_ids: list[int], feed: bool) -> None:
+    """
+    Проверяет подписку на поток.
+
+    - **post_ids**: Идентификаторы постов для подписки.
+    - **feed**: Подписаться ли на новые посты.
+
+    """
+    error = get_stream_topics_error(post_ids, feed)
+    if error is not None:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=error)
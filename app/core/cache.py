@@ -0,0 +1,229 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Iterable, Optional, Union
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.db.db import is_replica_session, reads_from_primary
+from app.core.serialization import render_response
+
+FEED_TAG = "posts:feed"
+
+
+def post_tag(post_id: int) -> str:
+    """
+    Возвращает тег закэшированных ответов, содержащих пост.
+
+    - **post_id**: Идентификатор поста.
+
+    """
+    return f"post:{post_id}"
+
+
+def make_cache_key(route: str, **params) -> str:
+    """
+    Формирует ключ кэша из имени маршрута и параметров запроса.
+
+    - **route**: Имя маршрута.
+    - **params**: Параметры запроса.
+
+    """
+    query = "&".join(f"{name}={value}" for name, value in sorted(params.items()))
+    return f"{route}?{query}"
+
+
+class CacheBackend:
+    """Хранилище кэша, которое ничего не хранит; базовый класс хранилищ."""
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """
+        Получает значение по ключу.
+
+        - **key**: Ключ кэша.
+
+        """
+        return None
+
+    async def set(
+        self, key: str, value: bytes, tags: Iterable[str], ttl: float
+    ) -> None:
+        """
+        Сохраняет значение с тегами для последующей инвалидации.
+
+        - **key**: Ключ кэша.
+        - **value**: Сохраняемое значение.
+        - **tags**: Теги значения.
+        - **ttl**: Время жизни значения в секундах.
+
+        """
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        """
+        Удаляет все значения, помеченные хотя бы одним из тегов.
+
+        - **tags**: Теги удаляемых значений.
+
+        """
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Хранилище кэша в памяти процесса с временем жизни и вытеснением LRU."""
+
+    def __init__(self, max_entries: int):
+        """
+        Создает пустое хранилище.
+
+        - **max_entries**: Максимальное количество значений в хранилище.
+
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[
+            str, tuple[float, bytes, tuple[str, ...]]
+        ] = OrderedDict()
+        self._tags: dict[str, set[str]] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value, _ = entry
+        if expires_at <= monotonic():
+            self._discard(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(
+        self, key: str, value: bytes, tags: Iterable[str], ttl: float
+    ) -> None:
+        self._discard(key)
+        tags = tuple(tags)
+        self._entries[key] = (monotonic() + ttl, value, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._discard(next(iter(self._entries)))
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            for key in self._tags.pop(tag, ()):
+                self._discard(key)
+
+    def _discard(self, key: str) -> None:
+        """Удаляет значение и его упоминания в индексе тегов."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisCacheBackend(CacheBackend):
+    """Общее для всех воркеров хранилище кэша в Redis."""
+
+    def __init__(self, url: str):
+        """
+        Подключается к Redis. Требует установленного пакета `redis`.
+
+        - **url**: Ссылка для подключения к Redis.
+
+        """
+        try:
+            from redis import asyncio as redis
+        except ImportError as error:
+            raise RuntimeError(
+                "Для CACHE_BACKEND=redis установите пакет redis."
+            ) from error
+        self._redis = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._redis.get(f"cache:{key}")
+
+    async def set(
+        self, key: str, value: bytes, tags: Iterable[str], ttl: float
+    ) -> None:
+        ttl_ms = int(ttl * 1000)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.set(f"cache:{key}", value, px=ttl_ms)
+            for tag in tags:
+                pipe.sadd(f"cache-tag:{tag}", f"cache:{key}")
+                pipe.pexpire(f"cache-tag:{tag}", ttl_ms)
+            await pipe.execute()
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        tag_keys = [f"cache-tag:{tag}" for tag in tags]
+        if not tag_keys:
+            return
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            members = await pipe.execute()
+        keys = set().union(*members)
+        await self._redis.delete(*keys, *tag_keys)
+
+
+def create_cache_backend() -> CacheBackend:
+    """Создает хранилище кэша, выбранное в настройках."""
+    if settings.CACHE_BACKEND == "memory":
+        return MemoryCacheBackend(settings.CACHE_MAX_ENTRIES)
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCacheBackend(settings.CACHE_URL)
+    return CacheBackend()
+
+
+response_cache = create_cache_backend()
+
+
+async def get_cached_response(request: Request, key: str) -> Optional[Response]:
+    """
+    Возвращает закэшированный ответ, если он есть.
+
+    Клиент, недавно писавший в базу данных, всегда получает свежие данные.
+
+    - **request**: Текущий запрос.
+    - **key**: Ключ кэша.
+
+    """
+    if reads_from_primary(request):
+        return None
+    content = await response_cache.get(key)
+    if content is None:
+        return None
+    return Response(content, media_type=JSONResponse.media_type)
+
+
+async def cache_response(
+    key: str,
+    data: Union[BaseModel, dict[str, Any]],
+    tags: Iterable[str],
+    session: AsyncSession,
+) -> Response:
+    """
+    Сериализует ответ, сохраняет его байты в кэш и возвращает ответ.
+
+    Ответ, прочитанный с реплики, хранится не дольше DB_READ_YOUR_WRITES_SECONDS -
+    допустимого отставания реплики. Отстающая реплика может вернуть данные,
+    которые уже изменены и сброшены из кэша, и такой ответ не должен жить
+    дольше, чем реплика отдавала бы их сама. Клиент, который сам недавно
+    писал, кэш не читает и поэтому видит свою запись сразу.
+
+    - **key**: Ключ кэша.
+    - **data**: Данные ответа.
+    - **tags**: Теги для инвалидации при записи.
+    - **session**: Сессия, в которой были прочитаны данные ответа.
+
+    """
+    response = render_response(data)
+    ttl = settings.CACHE_TTL_SECONDS
+    if is_replica_session(session):
+        ttl = min(ttl, settings.DB_READ_YOUR_WRITES_SECONDS)
+    await response_cache.set(key, response.body, tags, ttl)
+    return response
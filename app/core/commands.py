@@ -0,0 +1,48 @@
+import argparse
+import asyncio
+
+from app.core import user  # noqa: F401 - регистрирует обработчики задач
+from app.core.crud.post import post_crud
+from app.core.db.db import AsyncSessionLocal
+from app.core.jobs import job_worker
+
+
+async def repair_likes_count() -> None:
+    """Сверяет денормализованные счетчики лайков с таблицей лайков."""
+    async with AsyncSessionLocal() as session:
+        repaired = await post_crud.repair_likes_count(session)
+    print(f"Исправлено счетчиков лайков: {repaired}.")
+
+
+async def repair_trending_scores() -> None:
+    """Пересчитывает рейтинг популярности постов по таблице лайков."""
+    async with AsyncSessionLocal() as session:
+        repaired = await post_crud.repair_trending_scores(session)
+    print(f"Пересчитан рейтинг постов: {repaired}.")
+
+
+async def run_jobs() -> None:
+    """Выполняет все готовые фоновые задачи из outbox и завершается."""
+    executed = 0
+    while processed := await job_worker.run_pending():
+        executed += processed
+    print(f"Выполнено фоновых задач: {executed}.")
+
+
+COMMANDS = {
+    "repair-likes-count": repair_likes_count,
+    "repair-trending-scores": repair_trending_scores,
+    "run-jobs": run_jobs,
+}
+
+
+def main() -> None:
+    """Точка входа для служебных команд: `python -m app.core.commands <команда>`."""
+    parser = argparse.ArgumentParser(description="Служебные команды приложения.")
+    parser.add_argument("command", choices=COMMANDS)
+    args = parser.parse_args()
+    asyncio.run(COMMANDS[args.command]())
+
+
+if __name__ == "__main__":
+    main()
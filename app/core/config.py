@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseSettings
 
 
@@ -5,12 +7,66 @@ class Settings(BaseSettings):
     """Настройки проекта."""
 
     APP_TITLE: str = "Социальная сеть"
+    DEBUG: bool = False
     POSTGRES_DB: str
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
     DB_HOST: str
     DB_PORT: str
     SECRET: str = "SECRET"
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_REPLICA_URLS: list[str] = []
+    DB_REPLICA_RETRY_SECONDS: float = 30.0
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0
+    CACHE_BACKEND: Literal["none", "memory", "redis"] = "memory"
+    CACHE_URL: str = "redis://localhost:6379/0"
+    CACHE_TTL_SECONDS: float = 5.0
+    CACHE_MAX_ENTRIES: int = 10000
+    AUTH_TOKEN_LIFETIME_SECONDS: int = 3600
+    AUTH_TRUST_TOKEN_CLAIMS: bool = False
+    AUTH_REVOCATION_BACKEND: Literal["none", "memory", "redis"] = "none"
+    AUTH_REVOCATION_URL: str = "redis://localhost:6379/0"
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
+    FAST_JSON_SERIALIZATION: bool = True
+    BULK_MAX_ITEMS: int = 10000
+    BULK_CHUNK_SIZE: int = 1000
+    FEED_FANOUT_MAX_FOLLOWERS: int = 10000
+    FEED_BACKFILL_POSTS: int = 100
+    TRENDING_HALF_LIFE_HOURS: float = 6.0
+    TRENDING_MAX_LIMIT: int = 100
+    JOBS_WORKERS: int = 2
+    JOBS_BATCH_SIZE: int = 10
+    JOBS_POLL_INTERVAL_SECONDS: float = 1.0
+    JOBS_LEASE_SECONDS: float = 300.0
+    JOBS_MAX_ATTEMPTS: int = 10
+    JOBS_RETRY_BASE_SECONDS: float = 1.0
+    JOBS_RETRY_MAX_SECONDS: float = 600.0
+    STREAM_BUS_BACKEND: Literal["local", "redis"] = "local"
+    STREAM_BUS_URL: str = "redis://localhost:6379/0"
+    STREAM_BATCH_SECONDS: float = 0.5
+    STREAM_HEARTBEAT_SECONDS: float = 15.0
+    STREAM_MAX_POSTS: int = 100
+    STREAM_MAX_PENDING_POSTS: int = 100
+    SINGLE_FLIGHT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: Literal["none", "memory", "redis"] = "memory"
+    RATE_LIMIT_URL: str = "redis://localhost:6379/0"
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    RATE_LIMIT_TRUST_X_REAL_IP: bool = True
+    RATE_LIMIT_POSTS_PER_MINUTE: float = 30.0
+    RATE_LIMIT_POSTS_BURST: int = 10
+    RATE_LIMIT_LIKES_PER_MINUTE: float = 120.0
+    RATE_LIMIT_LIKES_BURST: int = 30
+    RATE_LIMIT_LOGIN_PER_MINUTE: float = 10.0
+    RATE_LIMIT_LOGIN_BURST: int = 5
+    REQUEST_METRICS_ENABLED: bool = False
+    REQUEST_METRICS_N_PLUS_ONE_THRESHOLD: int = 10
 
     class Config:
         env_file = ".env"
@@ -1,10 +1,12 @@
-from typing import Optional
+from typing import Any, Optional, Sequence
 
-from fastapi.encoders import jsonable_encoder
-from sqlalchemy import select
+from sqlalchemy import inspect, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db.models import User
+from app.core.jobs import Job, enqueue_jobs, job_worker
 
 
 class CRUDBase:
@@ -41,7 +43,7 @@ class CRUDBase:
         user: Optional[User] = None,
     ):
         """
-        Создает новый объект в базе данных.
+        Создает новый объект одним запросом INSERT ... RETURNING.
 
         - **obj_in**: Входные данные для создания объекта.
         - **session**: Асинхронная сессия для работы с базой данных.
@@ -51,11 +53,45 @@ class CRUDBase:
         obj_in_data = obj_in.dict()
         if user is not None:
             obj_in_data["author_id"] = user.id
-        db_obj = self.model(**obj_in_data)
-        session.add(db_obj)
-        await session.commit()
-        await session.refresh(db_obj)
-        return db_obj
+        return await self._execute_returning(
+            insert(self.model).values(**self._get_column_values(obj_in_data)),
+            "create",
+            session,
+        )
+
+    async def create_many(
+        self,
+        values: list[dict[str, Any]],
+        returning: Sequence,
+        session: AsyncSession,
+        chunk_size: int,
+    ) -> list[Row]:
+        """
+        Создает объекты пачками: одна пачка - один многострочный
+        INSERT ... ON CONFLICT DO NOTHING RETURNING и одна транзакция
+        вместе с фоновыми задачами созданных объектов.
+
+        Строки, нарушающие ограничения уникальности, пропускаются
+        и не попадают в результат.
+
+        - **values**: Значения колонок создаваемых объектов.
+        - **returning**: Колонки, возвращаемые для созданных объектов.
+        - **session**: Асинхронная сессия для работы с базой данных.
+        - **chunk_size**: Количество объектов в одной пачке.
+
+        """
+        rows = []
+        for start in range(0, len(values), chunk_size):
+            result = await session.execute(
+                insert(self.model)
+                .values(values[start : start + chunk_size])
+                .on_conflict_do_nothing()
+                .returning(*returning)
+            )
+            chunk_rows = result.all()
+            await self._commit(self.get_jobs("create", chunk_rows), session)
+            rows += chunk_rows
+        return rows
 
     async def update(
         self,
@@ -64,23 +100,21 @@ class CRUDBase:
         session: AsyncSession,
     ):
         """
-        Обновляет объект в базе данных.
+        Обновляет объект одним запросом UPDATE ... RETURNING.
 
         - **db_obj**: Обновляемый объект.
         - **obj_in**: Входные данные для обновления объекта.
         - **session**: Асинхронная сессия для работы с базой данных.
 
         """
-        obj_data = jsonable_encoder(db_obj)
-        update_data = obj_in.dict(exclude_unset=True)
-
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-        session.add(db_obj)
-        await session.commit()
-        await session.refresh(db_obj)
-        return db_obj
+        update_data = self._get_column_values(obj_in.dict(exclude_unset=True))
+        if not update_data:
+            return db_obj
+        return await self._execute_returning(
+            update(self.model).where(self.model.id == db_obj.id).values(**update_data),
+            "update",
+            session,
+        )
 
     async def delete(
         self,
@@ -95,5 +129,73 @@ class CRUDBase:
 
         """
         await session.delete(db_obj)
-        await session.commit()
+        await self._commit(self.get_jobs("delete", [db_obj]), session)
+        return db_obj
+
+    def get_jobs(self, action: str, objs: list) -> list[Job]:
+        """
+        Возвращает фоновые задачи, которые нужно выполнить после изменения
+        объектов. Задачи записываются в outbox в той же транзакции, поэтому
+        запрос ждет только основной записи. По умолчанию задач нет.
+
+        - **action**: Изменение: create, update или delete.
+        - **objs**: Измененные объекты или строки с их колонками.
+
+        """
+        return []
+
+    def _get_column_values(self, data: dict[str, Any]) -> dict[str, Any]:
+        """
+        Возвращает значения колонок модели, включая вычисляемые
+        валидаторами модели, например хеш текста поста.
+
+        - **data**: Входные данные; поля, не являющиеся колонками, пропускаются.
+
+        """
+        columns = [attribute.key for attribute in inspect(self.model).column_attrs]
+        obj = self.model(**{key: data[key] for key in columns if key in data})
+        return {key: obj.__dict__[key] for key in columns if key in obj.__dict__}
+
+    async def _execute_returning(self, statement, action: str, session: AsyncSession):
+        """
+        Выполняет INSERT или UPDATE, загружает объект из RETURNING
+        и фиксирует транзакцию без повторного SELECT.
+
+        Возвращаемый объект отсоединяется от сессии, чтобы фиксация
+        не сбросила его загруженные атрибуты. Отложенные колонки
+        не возвращаются.
+
+        - **statement**: Запрос INSERT или UPDATE.
+        - **action**: Изменение для выбора фоновых задач: create или update.
+        - **session**: Асинхронная сессия для работы с базой данных.
+
+        """
+        columns = [
+            attribute.columns[0]
+            for attribute in inspect(self.model).column_attrs
+            if not attribute.deferred
+        ]
+        db_obj = await session.execute(
+            select(self.model)
+            .from_statement(statement.returning(*columns))
+            .execution_options(populate_existing=True)
+        )
+        db_obj = db_obj.scalars().one()
+        session.expunge(db_obj)
+        await self._commit(self.get_jobs(action, [db_obj]), session)
         return db_obj
+
+    async def _commit(self, jobs: list[Job], session: AsyncSession) -> None:
+        """
+        Записывает фоновые задачи в outbox, фиксирует транзакцию
+        и будит обработчики задач.
+
+        - **jobs**: Фоновые задачи.
+        - **session**: Асинхронная сессия для работы с базой данных.
+
+        """
+        if jobs:
+            await enqueue_jobs(jobs, session)
+        await session.commit()
+        if jobs:
+            job_worker.wake()
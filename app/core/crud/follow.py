@@ -0,0 +1,129 @@
+from typing import Optional
+
+from sqlalchemy import Integer, cast, delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.crud.base import CRUDBase
+from app.core.db.models import Follow, Post, TimelineEntry, User
+
+
+class CRUDFollow(CRUDBase):
+    """CRUD операции для модели Follow."""
+
+    async def follow(
+        self, follower: User, author_id: int, session: AsyncSession
+    ) -> Optional[Row]:
+        """
+        Подписаться на пользователя одним запросом и добавить его последние
+        посты в ленту подписчика.
+
+        Подписка вставляется, только если автор существует и не совпадает
+        с подписчиком. Повторная подписка отклоняется уникальным ограничением.
+        Возвращает None, если подписка не была создана.
+
+        - **follower**: Подписывающийся пользователь.
+        - **author_id**: Идентификатор автора.
+        - **session**: Асинхронная сессия для работы с базой данных.
+
+        """
+        follower_id = follower.id
+        new_follow = await session.execute(
+            insert(Follow)
+            .from_select(
+                [Follow.follower_id, Follow.author_id],
+                select(cast(follower_id, Integer), User.id).where(
+                    User.id == author_id, User.id != follower_id
+                ),
+            )
+            .on_conflict_do_nothing(
+                index_elements=[Follow.follower_id, Follow.author_id]
+            )
+            .returning(Follow.id, Follow.author_id, Follow.created_at)
+        )
+        new_follow = new_follow.first()
+        if new_follow is None:
+            return None
+        await self._change_followers_count(author_id, 1, session)
+        await session.execute(
+            insert(TimelineEntry)
+            .from_select(
+                [
+                    TimelineEntry.user_id,
+                    TimelineEntry.post_id,
+                    TimelineEntry.post_created_at,
+                ],
+                select(cast(follower_id, Integer), Post.id, Post.created_at)
+                .where(Post.author_id == author_id)
+                .order_by(Post.created_at.desc(), Post.id.desc())
+                .limit(settings.FEED_BACKFILL_POSTS),
+            )
+            .on_conflict_do_nothing(
+                index_elements=[TimelineEntry.user_id, TimelineEntry.post_id]
+            )
+        )
+        await session.commit()
+        return new_follow
+
+    async def unfollow(
+        self, follower: User, author_id: int, session: AsyncSession
+    ) -> Optional[Row]:
+        """
+        Отписаться от пользователя и убрать его посты из ленты подписчика.
+
+        Возвращает None, если пользователь не был подписан.
+
+        - **follower**: Отписывающийся пользователь.
+        - **author_id**: Идентификатор автора.
+        - **session**: Асинхронная сессия для работы с базой данных.
+
+        """
+        follower_id = follower.id
+        deleted_follow = await session.execute(
+            delete(Follow)
+            .where(Follow.follower_id == follower_id, Follow.author_id == author_id)
+            .returning(Follow.id, Follow.author_id, Follow.created_at)
+            .execution_options(synchronize_session=False)
+        )
+        deleted_follow = deleted_follow.first()
+        if deleted_follow is None:
+            return None
+        await self._change_followers_count(author_id, -1, session)
+        await session.execute(
+            delete(TimelineEntry)
+            .where(
+                TimelineEntry.user_id == follower_id,
+                TimelineEntry.post_id.in_(
+                    select(Post.id).where(Post.author_id == author_id)
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+        return deleted_follow
+
+    async def _change_followers_count(
+        self, author_id: int, delta: int, session: AsyncSession
+    ) -> None:
+        """
+        Атомарно изменяет счетчик подписчиков пользователя.
+
+        - **author_id**: Идентификатор автора.
+        - **delta**: Величина изменения счетчика.
+        - **session**: Асинхронная сессия для работы с базой данных.
+
+        """
+        await session.execute(
+            update(User)
+            .where(User.id == author_id)
+            .values(
+                followers_count=User.followers_count + delta,
+                updated_at=User.updated_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+
+follow_crud = CRUDFollow(Follow)
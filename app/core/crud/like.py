@@ -1,26 +1,221 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Integer, case, cast, delete, null, select, tuple_, update
+from sqlalchemy.dialects.postgresql import Insert, insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy.sql.expression import ColumnElement
 
+from app.core.cache import post_tag, response_cache
+from app.core.config import settings
 from app.core.crud.base import CRUDBase
 from app.core.db.models import Like, Post, User
+from app.core.stream import publish_likes
+from app.core.trending import add_like_weight, get_like_weight, remove_like_weight
 
 
 class CRUDPost(CRUDBase):
     """CRUD операции для модели Post."""
 
-    async def leave_like(self, author: User, post: Post, session: AsyncSession):
+    async def get_post_likes(
+        self,
+        post_id: int,
+        limit: int,
+        session: AsyncSession,
+        cursor: Optional[tuple[datetime, int]] = None,
+    ):
+        """
+        Получает лайки поста вместе с их авторами одним запросом,
+        начиная с самых новых.
+
+        - **post_id**: Идентификатор поста.
+        - **limit**: Максимальное количество лайков для получения.
+        - **session**: Асинхронная сессия для работы с базой данных.
+        - **cursor**: Пара (created_at, id) последнего лайка предыдущей страницы
+        (опционально).
+
+        """
+        query = (
+            select(Like)
+            .where(Like.post_id == post_id)
+            .options(joinedload(Like.author))
+            .order_by(Like.created_at.desc(), Like.id.desc())
+            .limit(limit)
+        )
+        if cursor is not None:
+            query = query.where(tuple_(Like.created_at, Like.id) < cursor)
+        likes = await session.execute(query)
+        return likes.scalars().all()
+
+    async def get_liked_post_ids(
+        self, author_id: int, post_ids: list[int], session: AsyncSession
+    ) -> set[int]:
+        """
+        Возвращает идентификаторы постов из списка, на которые пользователь
+        поставил лайк, одним запросом по уникальному индексу (author_id, post_id).
+
+        - **author_id**: Идентификатор пользователя.
+        - **post_ids**: Идентификаторы постов.
+        - **session**: Асинхронная сессия для работы с базой данных.
+
+        """
+        if not post_ids:
+            return set()
+        liked = await session.execute(
+            select(Like.post_id).where(
+                Like.author_id == author_id, Like.post_id.in_(post_ids)
+            )
+        )
+        return set(liked.scalars())
+
+    async def leave_like(self, author: User, post_id: int, session: AsyncSession):
         """
-        Оставить лайк на посте.
+        Оставить лайк на посте одним запросом.
+
+        Лайк вставляется, только если пост существует и принадлежит другому
+        пользователю. Повторный лайк отклоняется уникальным ограничением,
+        в том числе при одновременных запросах. Возвращает None,
+        если лайк не был поставлен.
 
         - **author**: Пользователь, оставляющий лайк.
-        - **post**: Пост, на который оставляется лайк.
+        - **post_id**: Идентификатор поста, на который оставляется лайк.
+        - **session**: Асинхронная сессия для работы с базой данных.
+
+        """
+        new_like = await session.execute(
+            self._insert_likes(author.id, Post.id == post_id)
+        )
+        new_like = new_like.first()
+        if new_like is None:
+            return None
+        await self._change_likes_count([post_id], 1, new_like.created_at, session)
+        await self._commit(self.get_jobs("create", [new_like]), session)
+        await response_cache.invalidate_tags([post_tag(post_id)])
+        await publish_likes([post_id], 1)
+        return new_like
+
+    async def leave_likes(
+        self, author: User, post_ids: list[int], session: AsyncSession
+    ) -> dict[int, int]:
+        """
+        Оставить лайки на нескольких постах пачками.
+
+        Каждая пачка - один INSERT ... SELECT, одно обновление счетчиков
+        и одна транзакция. Как и в leave_like, пропускаются несуществующие
+        и собственные посты, а также повторные лайки.
+        Возвращает идентификаторы поставленных лайков по идентификаторам постов.
+
+        - **author**: Пользователь, оставляющий лайки.
+        - **post_ids**: Идентификаторы постов.
+        - **session**: Асинхронная сессия для работы с базой данных.
+
+        """
+        author_id, post_ids = author.id, list(dict.fromkeys(post_ids))
+        new_likes = {}
+        for start in range(0, len(post_ids), settings.BULK_CHUNK_SIZE):
+            chunk = post_ids[start : start + settings.BULK_CHUNK_SIZE]
+            rows = await session.execute(
+                self._insert_likes(author_id, Post.id.in_(chunk))
+            )
+            rows = rows.all()
+            if rows:
+                await self._change_likes_count(
+                    [row.post_id for row in rows], 1, rows[0].created_at, session
+                )
+            await self._commit(self.get_jobs("create", rows), session)
+            new_likes.update((row.post_id, row.id) for row in rows)
+        await response_cache.invalidate_tags(
+            [post_tag(post_id) for post_id in new_likes]
+        )
+        await publish_likes(new_likes, 1)
+        return new_likes
+
+    async def delete_like(self, author: User, post_id: int, session: AsyncSession):
+        """
+        Удалить лайк с поста одним запросом.
+
+        Возвращает None, если пользователь не ставил лайк на пост.
+
+        - **author**: Пользователь, удаляющий лайк.
+        - **post_id**: Идентификатор поста.
+        - **session**: Асинхронная сессия для работы с базой данных.
+
+        """
+        deleted_like = await session.execute(
+            delete(Like)
+            .where(Like.author_id == author.id, Like.post_id == post_id)
+            .returning(Like.id, Like.post_id, Like.created_at)
+            .execution_options(synchronize_session=False)
+        )
+        deleted_like = deleted_like.first()
+        if deleted_like is None:
+            return None
+        await self._change_likes_count([post_id], -1, deleted_like.created_at, session)
+        await self._commit(self.get_jobs("delete", [deleted_like]), session)
+        await response_cache.invalidate_tags([post_tag(post_id)])
+        await publish_likes([post_id], -1)
+        return deleted_like
+
+    def _insert_likes(self, author_id: int, condition: ColumnElement) -> Insert:
+        """
+        Строит запрос, вставляющий лайки на подходящие посты, кроме
+        собственных, без повторных лайков.
+
+        - **author_id**: Идентификатор пользователя, оставляющего лайки.
+        - **condition**: Условие отбора постов.
+
+        """
+        return (
+            insert(Like)
+            .from_select(
+                [Like.author_id, Like.post_id],
+                select(cast(author_id, Integer), Post.id).where(
+                    condition, Post.author_id != author_id
+                ),
+            )
+            .on_conflict_do_nothing(index_elements=[Like.author_id, Like.post_id])
+            .returning(Like.id, Like.post_id, Like.created_at)
+        )
+
+    async def _change_likes_count(
+        self,
+        post_ids: list[int],
+        delta: int,
+        liked_at: datetime,
+        session: AsyncSession,
+    ) -> None:
+        """
+        Атомарно изменяет счетчики лайков и рейтинг популярности постов
+        на стороне базы данных.
+
+        - **post_ids**: Идентификаторы постов.
+        - **delta**: 1 при добавлении лайка или -1 при удалении.
+        - **liked_at**: Время создания добавленного или удаленного лайка.
         - **session**: Асинхронная сессия для работы с базой данных.
 
         """
-        db_obj = Like(post=post, author=author)
-        session.add(db_obj)
-        await session.commit()
-        await session.refresh(db_obj)
-        return db_obj
+        weight = get_like_weight(liked_at)
+        if delta > 0:
+            trending_score = case(
+                (Post.trending_score.is_(None), weight),
+                else_=add_like_weight(Post.trending_score, weight),
+            )
+        else:
+            trending_score = case(
+                (Post.likes_count + delta <= 0, null()),
+                else_=remove_like_weight(Post.trending_score, weight),
+            )
+        await session.execute(
+            update(Post)
+            .where(Post.id.in_(post_ids))
+            .values(
+                likes_count=Post.likes_count + delta,
+                trending_score=trending_score,
+                updated_at=Post.updated_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
 
 
 like_crud = CRUDPost(Like)
@@ -1,75 +1,580 @@
-from sqlalchemy import select
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import (
+    extract,
+    func,
+    literal_column,
+    null,
+    select,
+    true,
+    tuple_,
+    union,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.sql import Select
 
+from app.core.cache import FEED_TAG, post_tag, response_cache
+from app.core.config import settings
 from app.core.crud.base import CRUDBase
-from app.core.db.models import Post
+from app.core.db.models import (
+    SEARCH_CONFIG,
+    Follow,
+    Like,
+    Post,
+    TimelineEntry,
+    User,
+    get_text_hash,
+)
+from app.core.jobs import Job, job_handler
+from app.core.singleflight import SingleFlight
+from app.core.stream import publish_new_posts
+from app.core.trending import SCORE_EPOCH, get_decay_rate
+
+FAN_OUT_JOB = "fan_out"
+
+post_detail_reads = SingleFlight("post_detail")
+
+
+class UserRow:
+    """Поля пользователя, необходимые схеме UserRead."""
+
+    __slots__ = ("id", "email", "is_active", "is_superuser", "is_verified")
+
+    def __init__(self, id, email, is_active, is_superuser, is_verified):
+        self.id = id
+        self.email = email
+        self.is_active = is_active
+        self.is_superuser = is_superuser
+        self.is_verified = is_verified
+
+
+class PostDetailRow:
+    """
+    Поля поста, необходимые схемам PostDetailDB и PostFeedDB, без состояния ORM.
+
+    Отметка liked_by_me заполняется отдельно для текущего пользователя.
+    """
+
+    __slots__ = ("id", "text", "created_at", "likes_count", "author", "liked_by_me")
+
+    def __init__(self, id, text, created_at, likes_count, *author):
+        self.id = id
+        self.text = text
+        self.created_at = created_at
+        self.likes_count = likes_count
+        self.author = UserRow(*author)
+        self.liked_by_me = None
+
+
+class PostSearchRow(PostDetailRow):
+    """Поля поста, необходимые схеме PostDetailDB, и его релевантность запросу."""
+
+    __slots__ = ("rank",)
+
+    def __init__(self, rank, *columns):
+        super().__init__(*columns)
+        self.rank = rank
+
+
+POST_DETAIL_COLUMNS = (
+    Post.id,
+    Post.text,
+    Post.created_at,
+    Post.likes_count,
+    User.id,
+    User.email,
+    User.is_active,
+    User.is_superuser,
+    User.is_verified,
+)
 
 
 class CRUDPost(CRUDBase):
     """CRUD операции для модели Post."""
 
-    async def get_post_with_author_and_likes_by_id(
+    async def create(self, obj_in, session: AsyncSession, user=None):
+        """Создает пост, сбрасывает кэш ленты и публикует пост в поток."""
+        post = await super().create(obj_in, session, user)
+        await response_cache.invalidate_tags([FEED_TAG])
+        await publish_new_posts([post.id])
+        return post
+
+    async def update(self, db_obj, obj_in, session: AsyncSession):
+        """Обновляет пост и сбрасывает кэш ответов, содержащих его."""
+        post = await super().update(db_obj, obj_in, session)
+        await response_cache.invalidate_tags([post_tag(post.id)])
+        return post
+
+    async def delete(self, db_obj, session: AsyncSession):
+        """Удаляет пост и сбрасывает кэш ответов, содержащих его, и ленты."""
+        post = await super().delete(db_obj, session)
+        await response_cache.invalidate_tags([FEED_TAG, post_tag(post.id)])
+        return post
+
+    def get_jobs(self, action: str, objs: list) -> list[Job]:
+        """Рассылает созданные посты в ленты подписчиков в фоне."""
+        if action != "create" or not objs:
+            return []
+        return [(FAN_OUT_JOB, {"post_ids": [obj.id for obj in objs]})]
+
+    async def create_posts(
+        self, posts_in: list, session: AsyncSession, user: User
+    ) -> list[Optional[int]]:
+        """
+        Создает посты пачками, сбрасывает кэш первых страниц ленты и публикует
+        появление постов подписчикам потока.
+
+        Возвращает идентификаторы созданных постов в порядке входных данных;
+        None - для текстов, которые уже есть в базе данных или повторяются
+        в пачке.
+
+        - **posts_in**: Данные для создания постов.
+        - **session**: Асинхронная сессия для работы с базой данных.
+        - **user**: Автор постов.
+
+        """
+        text_hashes = [get_text_hash(post_in.text) for post_in in posts_in]
+        values = {}
+        for text_hash, post_in in zip(text_hashes, posts_in):
+            values.setdefault(
+                text_hash,
+                {"text": post_in.text, "text_hash": text_hash, "author_id": user.id},
+            )
+        rows = await self.create_many(
+            list(values.values()),
+            (Post.id, Post.text_hash),
+            session,
+            settings.BULK_CHUNK_SIZE,
+        )
+        if rows:
+            await response_cache.invalidate_tags([FEED_TAG])
+            await publish_new_posts([post_id for post_id, _ in rows])
+        post_ids = {text_hash: post_id for post_id, text_hash in rows}
+        return [post_ids.pop(text_hash, None) for text_hash in text_hashes]
+
+    async def get_post_with_author_by_id(
+        self, post_id: int, session: AsyncSession, coalesce: bool = True
+    ) -> Optional[PostDetailRow]:
+        """
+        Получает пост с автором по его идентификатору одним запросом.
+
+        Одновременные запросы одного поста к одной базе данных объединяются,
+        если включена настройка SINGLE_FLIGHT_ENABLED: SQL-запрос выполняется
+        один раз, а остальные запросы получают ту же строку, не занимая
+        соединений из пула. Строка общая для всех запросов, ее нельзя изменять.
+
+        - **post_id**: Идентификатор поста.
+        - **session**: Асинхронная сессия для работы с базой данных.
+        - **coalesce**: Можно ли получить результат уже выполняющегося запроса;
+        False для клиента, недавно писавшего в базу данных (по умолчанию True).
+
+        """
+        if not (settings.SINGLE_FLIGHT_ENABLED and coalesce):
+            return await self._get_post_detail_row(post_id, session)
+        return await post_detail_reads.do(
+            (post_id, session.bind),
+            lambda: self._get_post_detail_row(post_id, session),
+        )
+
+    async def _get_post_detail_row(
         self, post_id: int, session: AsyncSession
-    ):
+    ) -> Optional[PostDetailRow]:
         """
-        Получает пост с автором и лайками по его идентификатору.
+        Получает пост с автором по его идентификатору.
 
         - **post_id**: Идентификатор поста.
         - **session**: Асинхронная сессия для работы с базой данных.
 
         """
         post = await session.execute(
-            select(Post)
-            .where(Post.id == post_id)
-            .options(selectinload(Post.author), selectinload(Post.likes))
+            select(*POST_DETAIL_COLUMNS).join(Post.author).where(Post.id == post_id)
         )
-        post = post.scalars().first()
-        return post
+        post = post.first()
+        return None if post is None else PostDetailRow(*post)
 
-    async def get_post_by_text(self, text: str, session: AsyncSession):
+    async def get_post_authors(
+        self, post_ids: list[int], session: AsyncSession
+    ) -> dict[int, int]:
         """
-        Получает пост по его тексту.
+        Получает идентификаторы авторов существующих постов.
 
-        - **text**: Текст поста.
+        - **post_ids**: Идентификаторы постов.
         - **session**: Асинхронная сессия для работы с базой данных.
 
         """
-        post = await session.execute(select(Post).where(Post.text == text))
-        post = post.scalars().first()
-        return post
+        rows = await session.execute(
+            select(Post.id, Post.author_id).where(Post.id.in_(post_ids))
+        )
+        return dict(rows.all())
 
-    async def get_post_with_likes_by_id(self, post_id: int, session: AsyncSession):
+    async def get_post_by_text(self, text: str, session: AsyncSession):
         """
-        Получает пост с лайками по его идентификатору.
+        Получает пост по его тексту, используя индекс по хешу текста.
 
-        - **post_id**: Идентификатор поста.
+        - **text**: Текст поста.
         - **session**: Асинхронная сессия для работы с базой данных.
 
         """
         post = await session.execute(
-            select(Post).where(Post.id == post_id).options(selectinload(Post.likes))
+            select(Post).where(Post.text_hash == get_text_hash(text))
         )
         post = post.scalars().first()
         return post
 
-    async def get_all_posts(self, limit: int, offset: int, session: AsyncSession):
+    async def get_all_posts(
+        self,
+        limit: int,
+        offset: int,
+        session: AsyncSession,
+        cursor: Optional[tuple[datetime, int]] = None,
+    ):
         """
-        Получает все посты с авторами и лайками.
+        Получает все посты с авторами, начиная с самых новых.
 
         - **limit**: Максимальное количество постов для получения.
         - **offset**: Смещение для получения постов.
         - **session**: Асинхронная сессия для работы с базой данных.
+        - **cursor**: Пара (created_at, id) последнего поста предыдущей страницы
+        (опционально). Если передан, смещение не используется.
 
         """
-        post = await session.execute(
-            select(Post)
-            .options(selectinload(Post.author), selectinload(Post.likes))
-            .limit(limit)
-            .offset(offset)
+        query = self._paginate(
+            select(Post).options(selectinload(Post.author)), limit, offset, cursor
         )
+        post = await session.execute(query)
         posts = post.scalars().all()
         return posts
 
+    async def get_all_post_rows(
+        self,
+        limit: int,
+        offset: int,
+        session: AsyncSession,
+        cursor: Optional[tuple[datetime, int]] = None,
+    ) -> list[PostDetailRow]:
+        """
+        Получает страницу ленты одним запросом, выбирая только колонки,
+        нужные для ответа, без загрузки объектов моделей в сессию.
+
+        - **limit**: Максимальное количество постов для получения.
+        - **offset**: Смещение для получения постов.
+        - **session**: Асинхронная сессия для работы с базой данных.
+        - **cursor**: Пара (created_at, id) последнего поста предыдущей страницы
+        (опционально). Если передан, смещение не используется.
+
+        """
+        query = self._paginate(
+            select(*POST_DETAIL_COLUMNS).join(Post.author), limit, offset, cursor
+        )
+        rows = await session.execute(query)
+        return [PostDetailRow(*row) for row in rows]
+
+    async def get_trending_rows(self, limit: int, session: AsyncSession):
+        """
+        Получает самые популярные посты по рейтингу лайков с затуханием.
+
+        Рейтинг поддерживается при каждом лайке, поэтому запрос читает
+        только первые записи индекса по рейтингу.
+
+        - **limit**: Максимальное количество постов для получения.
+        - **session**: Асинхронная сессия для работы с базой данных.
+
+        """
+        posts = await session.execute(
+            select(*POST_DETAIL_COLUMNS)
+            .join(Post.author)
+            .where(Post.trending_score.isnot(None))
+            .order_by(Post.trending_score.desc(), Post.id.desc())
+            .limit(limit)
+        )
+        return [PostDetailRow(*row) for row in posts]
+
+    async def search_post_rows(
+        self,
+        text: str,
+        limit: int,
+        session: AsyncSession,
+        cursor: Optional[tuple[float, int]] = None,
+    ) -> list[PostSearchRow]:
+        """
+        Ищет посты по тексту через полнотекстовый индекс, начиная с самых
+        релевантных.
+
+        - **text**: Поисковый запрос в синтаксисе websearch_to_tsquery.
+        - **limit**: Максимальное количество постов для получения.
+        - **session**: Асинхронная сессия для работы с базой данных.
+        - **cursor**: Пара (rank, id) последнего поста предыдущей страницы
+        (опционально).
+
+        """
+        query = func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'"), text)
+        rank = func.ts_rank(Post.search_vector, query)
+        statement = (
+            select(rank, *POST_DETAIL_COLUMNS)
+            .join(Post.author)
+            .where(Post.search_vector.bool_op("@@")(query))
+            .order_by(rank.desc(), Post.id.desc())
+            .limit(limit)
+        )
+        if cursor is not None:
+            statement = statement.where(tuple_(rank, Post.id) < cursor)
+        posts = await session.execute(statement)
+        return [PostSearchRow(*row) for row in posts]
+
+    async def fan_out(self, post_ids: list[int], session: AsyncSession) -> None:
+        """
+        Рассылает посты в ленты подписчиков их авторов пачками.
+
+        Посты авторов, у которых больше FEED_FANOUT_MAX_FOLLOWERS подписчиков,
+        не рассылаются: подписчики читают их из таблицы постов при чтении ленты.
+        Обработанными отмечаются посты всех авторов, чтобы частичный индекс
+        постов, ожидающих рассылки, содержал только очередь задач.
+
+        - **post_ids**: Идентификаторы постов.
+        - **session**: Асинхронная сессия для работы с базой данных.
+
+        """
+        regular_authors = select(User.id).where(
+            User.followers_count <= settings.FEED_FANOUT_MAX_FOLLOWERS
+        )
+        for start in range(0, len(post_ids), settings.BULK_CHUNK_SIZE):
+            chunk = post_ids[start : start + settings.BULK_CHUNK_SIZE]
+            await session.execute(
+                insert(TimelineEntry)
+                .from_select(
+                    [
+                        TimelineEntry.user_id,
+                        TimelineEntry.post_id,
+                        TimelineEntry.post_created_at,
+                    ],
+                    select(Follow.follower_id, Post.id, Post.created_at)
+                    .join(Follow, Follow.author_id == Post.author_id)
+                    .where(Post.id.in_(chunk), Post.author_id.in_(regular_authors)),
+                )
+                .on_conflict_do_nothing(
+                    index_elements=[TimelineEntry.user_id, TimelineEntry.post_id]
+                )
+            )
+            await session.execute(
+                update(Post)
+                .where(Post.id.in_(chunk))
+                .values(fanned_out=True, updated_at=Post.updated_at)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+
+    async def get_timeline_rows(
+        self,
+        user_id: int,
+        limit: int,
+        session: AsyncSession,
+        cursor: Optional[tuple[datetime, int]] = None,
+    ) -> list[PostDetailRow]:
+        """
+        Получает страницу персональной ленты, начиная с самых новых постов.
+
+        Лента собирается из трех частей, каждая из которых ограничена размером
+        страницы и не зависит от количества подписок читателя:
+        - записи ленты, разосланные при публикации, по индексу ленты;
+        - посты популярных авторов, у которых больше FEED_FANOUT_MAX_FOLLOWERS
+        подписчиков: таких авторов немного, они находятся по индексу
+        followers_count, а подписка проверяется по уникальному индексу;
+        - посты, рассылка которых еще ждет в очереди задач, по частичному
+        индексу: он содержит только очередь, поэтому новый пост виден в ленте
+        сразу после публикации.
+        Части объединяются через UNION, который убирает посты, попавшие в
+        несколько частей, и только итоговая страница соединяется с постами
+        и авторами.
+
+        - **user_id**: Идентификатор читателя ленты.
+        - **limit**: Максимальное количество постов для получения.
+        - **session**: Асинхронная сессия для работы с базой данных.
+        - **cursor**: Пара (created_at, id) последнего поста предыдущей страницы
+        (опционально).
+
+        """
+        pushed = select(
+            TimelineEntry.post_id.label("id"),
+            TimelineEntry.post_created_at.label("created_at"),
+        ).where(TimelineEntry.user_id == user_id)
+        if cursor is not None:
+            pushed = pushed.where(
+                tuple_(TimelineEntry.post_created_at, TimelineEntry.post_id) < cursor
+            )
+        pushed = pushed.order_by(
+            TimelineEntry.post_created_at.desc(), TimelineEntry.post_id.desc()
+        ).limit(limit)
+        popular_authors = (
+            select(User.id)
+            .where(
+                User.followers_count > settings.FEED_FANOUT_MAX_FOLLOWERS,
+                self._follows(user_id, User.id),
+            )
+            .subquery()
+        )
+        author_posts = self._paginate(
+            select(Post.id, Post.created_at).where(
+                Post.author_id == popular_authors.c.id
+            ),
+            limit,
+            0,
+            cursor,
+        ).lateral()
+        pulled = select(author_posts.c.id, author_posts.c.created_at).select_from(
+            popular_authors.join(author_posts, true())
+        )
+        pending = self._paginate(
+            select(Post.id, Post.created_at).where(
+                ~Post.fanned_out, self._follows(user_id, Post.author_id)
+            ),
+            limit,
+            0,
+            cursor,
+        )
+        candidates = union(
+            select(pushed.subquery()), pulled, select(pending.subquery())
+        ).subquery()
+        page = (
+            select(candidates.c.id)
+            .order_by(candidates.c.created_at.desc(), candidates.c.id.desc())
+            .limit(limit)
+            .subquery()
+        )
+        query = self._paginate(
+            select(*POST_DETAIL_COLUMNS)
+            .join(Post.author)
+            .join(page, page.c.id == Post.id),
+            limit,
+            0,
+            None,
+        )
+        rows = await session.execute(query)
+        return [PostDetailRow(*row) for row in rows]
+
+    def _follows(self, follower_id: int, author_id):
+        """
+        Возвращает условие, что пользователь подписан на автора.
+
+        - **follower_id**: Идентификатор подписчика.
+        - **author_id**: Выражение с идентификатором автора.
+
+        """
+        return (
+            select(Follow.id)
+            .where(Follow.follower_id == follower_id, Follow.author_id == author_id)
+            .exists()
+        )
+
+    def _paginate(
+        self,
+        query: Select,
+        limit: int,
+        offset: int,
+        cursor: Optional[tuple[datetime, int]],
+    ) -> Select:
+        """
+        Упорядочивает посты от новых к старым и ограничивает страницу.
+
+        - **query**: Запрос постов.
+        - **limit**: Максимальное количество постов.
+        - **offset**: Смещение, если курсор не передан.
+        - **cursor**: Пара (created_at, id) последнего поста предыдущей страницы.
+
+        """
+        query = query.order_by(Post.created_at.desc(), Post.id.desc()).limit(limit)
+        if cursor is not None:
+            return query.where(tuple_(Post.created_at, Post.id) < cursor)
+        return query.offset(offset)
+
+    async def repair_likes_count(self, session: AsyncSession) -> int:
+        """
+        Пересчитывает счетчики лайков у постов, где они разошлись с таблицей лайков.
+
+        Возвращает количество исправленных постов.
+
+        - **session**: Асинхронная сессия для работы с базой данных.
+
+        """
+        actual_count = (
+            select(func.count(Like.id)).where(Like.post_id == Post.id).scalar_subquery()
+        )
+        result = await session.execute(
+            update(Post)
+            .where(Post.likes_count != actual_count)
+            .values(likes_count=actual_count, updated_at=Post.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+        return result.rowcount
+
+    async def repair_trending_scores(self, session: AsyncSession) -> int:
+        """
+        Пересчитывает рейтинг популярности всех постов по таблице лайков.
+
+        Нужен после изменения TRENDING_HALF_LIFE_HOURS или расхождения рейтинга
+        с лайками. Возвращает количество постов с лайками.
+
+        - **session**: Асинхронная сессия для работы с базой данных.
+
+        """
+        like_weight = get_decay_rate() * (
+            extract("epoch", Like.created_at)
+            - (SCORE_EPOCH - datetime(1970, 1, 1)).total_seconds()
+        )
+        weights = (
+            select(
+                Like.post_id,
+                like_weight.label("weight"),
+                func.max(like_weight)
+                .over(partition_by=Like.post_id)
+                .label("max_weight"),
+            )
+            .where(Like.post_id.isnot(None))
+            .subquery()
+        )
+        scores = (
+            select(
+                weights.c.post_id,
+                (
+                    func.max(weights.c.max_weight)
+                    + func.ln(
+                        func.sum(func.exp(weights.c.weight - weights.c.max_weight))
+                    )
+                ).label("trending_score"),
+            )
+            .group_by(weights.c.post_id)
+            .subquery()
+        )
+        result = await session.execute(
+            update(Post)
+            .where(Post.id == scores.c.post_id)
+            .values(trending_score=scores.c.trending_score, updated_at=Post.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        await session.execute(
+            update(Post)
+            .where(Post.likes_count == 0, Post.trending_score.isnot(None))
+            .values(trending_score=null(), updated_at=Post.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+        return result.rowcount
+
 
 post_crud = CRUDPost(Post)
+
+
+@job_handler(FAN_OUT_JOB)
+async def fan_out_posts(payload: dict, session: AsyncSession) -> None:
+    """
+    Рассылает посты в ленты подписчиков. Повторная рассылка ничего не меняет.
+
+    - **payload**: Параметры задачи с идентификаторами постов.
+    - **session**: Асинхронная сессия для работы с базой данных.
+
+    """
+    await post_crud.fan_out(payload["post_ids"], session)
@@ -1,13 +1,127 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from time import time
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
+from app.core.db.pool import InstrumentedAsyncPool
+from app.core.db.replicas import REPLICA_INFO_KEY, ReplicaRouter
+
+READ_FROM_PRIMARY_COOKIE = "read_from_primary_until"
+
+
+def create_engine(database_url: str) -> AsyncEngine:
+    """
+    Создает асинхронный движок с настройками пула из конфигурации.
+
+    Размер кэша подготовленных запросов передается только драйверу asyncpg:
+    другие драйверы не принимают такой параметр.
+
+    - **database_url**: Ссылка для подключения к базе данных.
+
+    """
+    connect_args = {}
+    if make_url(database_url).get_driver_name() == "asyncpg":
+        connect_args["statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
+    return create_async_engine(
+        database_url,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+
 
-engine = create_async_engine(settings.database_url)
+engine = create_engine(settings.database_url)
 
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession)
 
+replica_router = ReplicaRouter(
+    [create_engine(url) for url in settings.DB_REPLICA_URLS],
+    engine,
+    settings.DB_REPLICA_RETRY_SECONDS,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def mark_read_from_primary(session: Session) -> None:
+    """
+    После записи направляет чтения клиента на основную базу данных,
+    пока реплики не догонят ее.
+
+    - **session**: Синхронная сессия, в которой произошел коммит.
+
+    """
+    response = session.info.get("response")
+    if response is None:
+        return
+    lag = settings.DB_READ_YOUR_WRITES_SECONDS
+    response.set_cookie(
+        READ_FROM_PRIMARY_COOKIE,
+        str(int(time() + lag)),
+        max_age=int(lag) + 1,
+        httponly=True,
+    )
+
+
+def reads_from_primary(request: Request) -> bool:
+    """
+    Проверяет, писал ли клиент в базу данных достаточно недавно,
+    чтобы реплика могла еще не получить его изменения.
+
+    - **request**: Текущий запрос.
 
-async def get_async_session():
+    """
+    until = request.cookies.get(READ_FROM_PRIMARY_COOKIE, "")
+    return until.isdigit() and int(until) >= time()
+
+
+def is_replica_session(session: AsyncSession) -> bool:
+    """
+    Проверяет, открыта ли сессия на реплике.
+
+    - **session**: Асинхронная сессия для работы с базой данных.
+
+    """
+    return REPLICA_INFO_KEY in session.sync_session.info
+
+
+async def get_async_session(response: Response):
     async with AsyncSessionLocal() as async_session:
+        async_session.sync_session.info["response"] = response
+        yield async_session
+
+
+def open_read_session(from_primary: bool = False) -> AsyncSession:
+    """
+    Открывает сессию только для чтения: на реплике, если она доступна,
+    иначе на основной базе данных.
+
+    - **from_primary**: Читать ли с основной базы данных, например после
+    недавней записи клиента (по умолчанию False).
+
+    """
+    async_session = None
+    if not from_primary:
+        async_session = replica_router.get_session()
+    if async_session is None:
+        async_session = AsyncSessionLocal()
+    return async_session
+
+
+async def get_async_read_session(request: Request):
+    """
+    Получает сессию только для чтения: на реплике, если она доступна,
+    и на основной базе данных после недавней записи клиента.
+
+    - **request**: Текущий запрос.
+
+    """
+    async with open_read_session(reads_from_primary(request)) as async_session:
         yield async_session
@@ -1,8 +1,60 @@
+import hashlib
+
 from fastapi_users_db_sqlalchemy import SQLAlchemyBaseUserTable
-from sqlalchemy import TIMESTAMP, Column, Integer, Text, func
+from sqlalchemy import (
+    JSON,
+    TIMESTAMP,
+    Boolean,
+    Column,
+    Computed,
+    Float,
+    Index,
+    Integer,
+    String,
+    Text,
+    false,
+    func,
+)
+from sqlalchemy import text as sql_text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import as_declarative
-from sqlalchemy.orm import relationship
-from sqlalchemy.schema import ForeignKey
+from sqlalchemy.orm import deferred, relationship, validates
+from sqlalchemy.schema import ForeignKey, UniqueConstraint
+from sqlalchemy.sql.expression import FunctionElement
+
+SEARCH_CONFIG = "russian"
+
+
+def get_text_hash(text: str) -> str:
+    """
+    Возвращает SHA-256 хеш текста поста для проверки дубликатов.
+
+    - **text**: Текст поста.
+
+    """
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class post_search_vector(FunctionElement):
+    """
+    Выражение поискового вектора поста для вычисляемой колонки.
+
+    SQLite не умеет строить tsvector, поэтому там колонка остается пустой:
+    create_all работает, но поиск постов поддерживается только в PostgreSQL.
+    """
+
+    inherit_cache = True
+
+
+@compiles(post_search_vector)
+def compile_post_search_vector(element, compiler, **kwargs):
+    return f"to_tsvector('{SEARCH_CONFIG}', text)"
+
+
+@compiles(post_search_vector, "sqlite")
+def compile_post_search_vector_sqlite(element, compiler, **kwargs):
+    return "''"
 
 
 @as_declarative()
@@ -26,6 +78,9 @@ class User(SQLAlchemyBaseUserTable[int], Base):
 
     __tablename__ = "users"
 
+    followers_count = Column(
+        Integer, default=0, server_default="0", nullable=False, index=True
+    )
     posts = relationship("Post", back_populates="author")
     likes = relationship("Like", back_populates="author")
 
@@ -34,19 +89,119 @@ class Post(Base):
     """Модель для постов."""
 
     __tablename__ = "posts"
+    __table_args__ = (
+        Index("ix_posts_created_at_id", "created_at", "id"),
+        Index("ix_posts_author_id_created_at_id", "author_id", "created_at", "id"),
+        Index(
+            "ix_posts_created_at_id_not_fanned_out",
+            "created_at",
+            "id",
+            postgresql_where=sql_text("NOT fanned_out"),
+        ),
+        Index(
+            "ix_posts_trending_score_id",
+            "trending_score",
+            "id",
+            postgresql_where=sql_text("trending_score IS NOT NULL"),
+        ),
+        Index("ix_posts_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
-    text = Column(Text, unique=True, nullable=False)
+    text = Column(Text, nullable=False)
+    text_hash = Column(String(64), unique=True, index=True, nullable=False)
+    likes_count = Column(Integer, default=0, server_default="0", nullable=False)
+    trending_score = Column(Float, nullable=True)
+    search_vector = deferred(
+        Column(
+            TSVECTOR().with_variant(Text(), "sqlite"),
+            Computed(post_search_vector(), persisted=True),
+            nullable=False,
+        )
+    )
+    fanned_out = Column(Boolean, default=False, server_default=false(), nullable=False)
     author_id = Column(Integer, ForeignKey(User.id, ondelete="CASCADE"), nullable=False)
     author = relationship("User", back_populates="posts")
     likes = relationship("Like", back_populates="post")
 
+    @validates("text")
+    def validate_text(self, key: str, text: str) -> str:
+        """Обновляет хеш текста при каждом изменении текста поста."""
+        self.text_hash = get_text_hash(text)
+        return text
+
 
 class Like(Base):
     """Модель для лайков."""
 
     __tablename__ = "likes"
+    __table_args__ = (
+        Index("ix_likes_post_id_created_at_id", "post_id", "created_at", "id"),
+        UniqueConstraint("author_id", "post_id", name="uq_likes_author_id_post_id"),
+    )
 
     author_id = Column(Integer, ForeignKey(User.id, ondelete="CASCADE"), nullable=False)
     author = relationship("User", back_populates="likes")
     post_id = Column(Integer, ForeignKey(Post.id), nullable=True)
     post = relationship("Post", back_populates="likes")
+
+
+class Follow(Base):
+    """Модель для подписок пользователей друг на друга."""
+
+    __tablename__ = "follows"
+    __table_args__ = (
+        UniqueConstraint(
+            "follower_id", "author_id", name="uq_follows_follower_id_author_id"
+        ),
+        Index("ix_follows_author_id", "author_id"),
+    )
+
+    follower_id = Column(
+        Integer, ForeignKey(User.id, ondelete="CASCADE"), nullable=False
+    )
+    author_id = Column(Integer, ForeignKey(User.id, ondelete="CASCADE"), nullable=False)
+
+
+class TimelineEntry(Base):
+    """Модель для записей персональной ленты, разосланных при публикации поста."""
+
+    __tablename__ = "timeline"
+    __table_args__ = (
+        UniqueConstraint("user_id", "post_id", name="uq_timeline_user_id_post_id"),
+        Index(
+            "ix_timeline_user_id_post_created_at_post_id",
+            "user_id",
+            "post_created_at",
+            "post_id",
+        ),
+        Index("ix_timeline_post_id", "post_id"),
+    )
+
+    user_id = Column(Integer, ForeignKey(User.id, ondelete="CASCADE"), nullable=False)
+    post_id = Column(Integer, ForeignKey(Post.id, ondelete="CASCADE"), nullable=False)
+    post_created_at = Column(TIMESTAMP, nullable=False)
+
+
+class OutboxJob(Base):
+    """
+    Модель для фоновых задач, записанных в одной транзакции с изменением данных.
+
+    Задача готова к выполнению после run_after; пустой run_after означает,
+    что попытки выполнить задачу исчерпаны.
+    """
+
+    __tablename__ = "outbox"
+    __table_args__ = (
+        Index(
+            "ix_outbox_run_after_id",
+            "run_after",
+            "id",
+            postgresql_where=sql_text("run_after IS NOT NULL"),
+        ),
+    )
+
+    kind = Column(String(64), nullable=False)
+    payload = Column(JSON, nullable=False)
+    attempts = Column(Integer, default=0, server_default="0", nullable=False)
+    run_after = Column(TIMESTAMP, nullable=True)
+    last_error = Column(Text, nullable=True)
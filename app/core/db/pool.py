@@ -0,0 +1,33 @@
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.metrics import Histogram
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Пул соединений, измеряющий время ожидания выдачи соединения."""
+
+    def __init__(self, *args, **kwargs):
+        """Создает пул и гистограмму времени ожидания соединения."""
+        super().__init__(*args, **kwargs)
+        self.checkout_wait = Histogram()
+
+    def _do_get(self):
+        """Выдает соединение из пула, замеряя время ожидания."""
+        started_at = perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.checkout_wait.observe(perf_counter() - started_at)
+
+    def stats(self) -> dict[str, Any]:
+        """Возвращает текущее состояние пула и гистограмму ожидания."""
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "checkout_wait": self.checkout_wait.snapshot(),
+        }
@@ -0,0 +1,171 @@
+import asyncio
+from itertools import count
+from time import monotonic
+from typing import Optional
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
+
+REPLICA_INFO_KEY = "replica"
+
+CONNECTION_ERRORS = (DBAPIError, OSError, asyncio.TimeoutError, PoolTimeoutError)
+
+
+def is_disconnect(error: Exception) -> bool:
+    """
+    Проверяет, что запрос не выполнился из-за разрыва соединения, а не из-за
+    ошибки в самом запросе.
+
+    - **error**: Ошибка выполнения запроса.
+
+    """
+    if isinstance(error, DBAPIError):
+        return error.connection_invalidated
+    return isinstance(error, (OSError, asyncio.TimeoutError))
+
+
+class ReplicaSession(Session):
+    """
+    Синхронная сессия реплики, которая повторяет чтение на основной базе данных.
+
+    Если к реплике не удается подключиться или соединение с ней рвется во
+    время запроса, она помечается недоступной на `retry_seconds`, а сессия
+    откатывается, переключается на основную базу данных и повторяет запрос.
+    Повтор безопасен, потому что сессия реплики только читает. Сессии,
+    открытые до того, как реплику пометили недоступной, переключаются сразу,
+    не дожидаясь своей ошибки. Запросы, уже ждущие соединения из пула
+    недоступной реплики, переключаются после DB_POOL_TIMEOUT.
+    """
+
+    def __init__(self, *args, replica: "Replica", retry_seconds: float, **kwargs):
+        """
+        Создает сессию реплики.
+
+        - **replica**: Реплика, на которой открыта сессия.
+        - **retry_seconds**: Сколько секунд не обращаться к недоступной реплике.
+
+        """
+        super().__init__(*args, **kwargs)
+        self.replica = replica
+        self.retry_seconds = retry_seconds
+        self.info[REPLICA_INFO_KEY] = replica.name
+
+    def execute(self, *args, **kwargs):
+        if REPLICA_INFO_KEY in self.info and not self._connect_replica():
+            self._use_fallback()
+        if REPLICA_INFO_KEY not in self.info:
+            return super().execute(*args, **kwargs)
+        try:
+            return super().execute(*args, **kwargs)
+        except CONNECTION_ERRORS as error:
+            if not is_disconnect(error):
+                raise
+        self._mark_unhealthy()
+        self._use_fallback()
+        return super().execute(*args, **kwargs)
+
+    def _connect_replica(self) -> bool:
+        """
+        Берет соединение с репликой, если ее не пометили недоступной.
+
+        Любая ошибка подключения помечает реплику недоступной.
+        Возвращает False, если читать с реплики нельзя.
+
+        """
+        if self.replica.unhealthy_until > monotonic():
+            return False
+        try:
+            self.connection()
+        except CONNECTION_ERRORS:
+            self._mark_unhealthy()
+            return False
+        return True
+
+    def _mark_unhealthy(self) -> None:
+        """Помечает реплику недоступной на `retry_seconds`."""
+        self.replica.unhealthy_until = monotonic() + self.retry_seconds
+
+    def _use_fallback(self) -> None:
+        """Откатывает сессию и переключает ее на основную базу данных."""
+        self.rollback()
+        self.bind = self.replica.fallback_engine.sync_engine
+        del self.info[REPLICA_INFO_KEY]
+
+
+class Replica:
+    """Реплика базы данных и ее состояние."""
+
+    def __init__(
+        self,
+        name: str,
+        engine: AsyncEngine,
+        fallback_engine: AsyncEngine,
+        retry_seconds: float,
+    ):
+        """
+        Создает реплику.
+
+        - **name**: Имя реплики для метрик.
+        - **engine**: Асинхронный движок для подключения к реплике.
+        - **fallback_engine**: Движок основной базы данных для повтора чтений.
+        - **retry_seconds**: Сколько секунд не обращаться к недоступной реплике.
+
+        """
+        self.name = name
+        self.engine = engine
+        self.fallback_engine = fallback_engine
+        self.session_factory = sessionmaker(
+            engine,
+            class_=AsyncSession,
+            sync_session_class=ReplicaSession,
+            replica=self,
+            retry_seconds=retry_seconds,
+        )
+        self.unhealthy_until = 0.0
+
+
+class ReplicaRouter:
+    """Распределяет читающие сессии по репликам по кругу."""
+
+    def __init__(
+        self,
+        engines: list[AsyncEngine],
+        fallback_engine: AsyncEngine,
+        retry_seconds: float,
+    ):
+        """
+        Создает маршрутизатор реплик.
+
+        - **engines**: Движки реплик.
+        - **fallback_engine**: Движок основной базы данных для повтора чтений.
+        - **retry_seconds**: Сколько секунд не обращаться к недоступной реплике.
+
+        """
+        self.replicas = [
+            Replica(f"replica-{index}", engine, fallback_engine, retry_seconds)
+            for index, engine in enumerate(engines)
+        ]
+        self._counter = count()
+
+    def get_session(self) -> Optional[AsyncSession]:
+        """
+        Открывает сессию на следующей по кругу реплике, не помеченной
+        недоступной.
+
+        Сессия не проверяет реплику заранее и берет соединение только при
+        первом запросе, поэтому чтение не тратит лишних обращений к пулу,
+        а запрос, ожидающий чужого результата, не занимает соединение.
+        Недоступность реплики обнаруживается при чтении (см. ReplicaSession).
+        Возвращает None, если все реплики помечены недоступными.
+
+        """
+        if not self.replicas:
+            return None
+        start = next(self._counter) % len(self.replicas)
+        now = monotonic()
+        for replica in self.replicas[start:] + self.replicas[:start]:
+            if replica.unhealthy_until <= now:
+                return replica.session_factory()
+        return None
@@ -0,0 +1,275 @@
+import logging
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+from typing import Callable, Optional
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import Histogram, format_histogram
+
+STATEMENT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+UNMATCHED_ROUTE = "unmatched"
+
+logger = logging.getLogger(__name__)
+
+
+class RequestStats:
+    """Статистика обработки одного запроса."""
+
+    def __init__(self):
+        """Создает пустую статистику запроса."""
+        self.statements = 0
+        self.db_time = 0.0
+        self.serialization_time: Optional[float] = None
+        self.statement_started_at: Optional[float] = None
+        self.endpoint_finished_at: Optional[float] = None
+
+    def server_timing(self, total: float) -> str:
+        """
+        Возвращает значение заголовка Server-Timing.
+
+        - **total**: Время обработки запроса в секундах.
+
+        """
+        metrics = [f'db;dur={self.db_time * 1000:.2f};desc="{self.statements} SQL"']
+        if self.serialization_time is not None:
+            metrics.append(f"serialize;dur={self.serialization_time * 1000:.2f}")
+        metrics.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(metrics)
+
+
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "request_stats", default=None
+)
+
+
+def before_cursor_execute(*args) -> None:
+    """Запоминает время начала SQL-запроса, если запрос замеряется."""
+    stats = request_stats.get()
+    if stats is not None:
+        stats.statement_started_at = perf_counter()
+
+
+def after_cursor_execute(*args) -> None:
+    """Учитывает выполненный SQL-запрос в статистике текущего запроса."""
+    stats = request_stats.get()
+    if stats is not None and stats.statement_started_at is not None:
+        stats.statements += 1
+        stats.db_time += perf_counter() - stats.statement_started_at
+        stats.statement_started_at = None
+
+
+def listen_engines(engines: list[AsyncEngine]) -> None:
+    """
+    Подписывается на выполнение SQL-запросов движками.
+
+    - **engines**: Движки основной базы данных и реплик.
+
+    """
+    for engine in engines:
+        event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+
+
+class RouteMetrics:
+    """Гистограммы запросов к одному маршруту."""
+
+    def __init__(self):
+        """Создает пустые гистограммы маршрута."""
+        self.duration = Histogram()
+        self.db_time = Histogram()
+        self.serialization_time = Histogram()
+        self.statements = Histogram(STATEMENT_BUCKETS)
+        self.n_plus_one = 0
+
+
+class RequestMetrics:
+    """Метрики запросов текущего процесса в разрезе маршрутов."""
+
+    def __init__(self, n_plus_one_threshold: int):
+        """
+        Создает пустой реестр метрик.
+
+        - **n_plus_one_threshold**: Количество SQL-запросов, после которого
+        запрос считается подозрительным на проблему N+1.
+
+        """
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.routes: dict[tuple[str, str], RouteMetrics] = {}
+
+    def observe(
+        self, method: str, route: str, stats: RequestStats, duration: float
+    ) -> None:
+        """
+        Добавляет статистику запроса в гистограммы маршрута.
+
+        - **method**: HTTP-метод запроса.
+        - **route**: Шаблон пути маршрута.
+        - **stats**: Статистика запроса.
+        - **duration**: Время обработки запроса в секундах.
+
+        """
+        metrics = self.routes.get((method, route))
+        if metrics is None:
+            metrics = self.routes[method, route] = RouteMetrics()
+        metrics.duration.observe(duration)
+        metrics.db_time.observe(stats.db_time)
+        metrics.statements.observe(stats.statements)
+        if stats.serialization_time is not None:
+            metrics.serialization_time.observe(stats.serialization_time)
+        if stats.statements > self.n_plus_one_threshold:
+            metrics.n_plus_one += 1
+            logger.warning(
+                "Возможная проблема N+1: %s %s выполнил %s SQL-запросов.",
+                method,
+                route,
+                stats.statements,
+            )
+
+    def render(self) -> str:
+        """Возвращает метрики в текстовом формате Prometheus."""
+        labels = {key: f'method="{key[0]}",route="{key[1]}"' for key in self.routes}
+        lines = []
+        for name, attribute, description in (
+            (
+                "http_request_duration_seconds",
+                "duration",
+                "Время обработки запроса.",
+            ),
+            ("http_request_db_seconds", "db_time", "Время SQL-запросов."),
+            (
+                "http_request_serialization_seconds",
+                "serialization_time",
+                "Время сериализации ответа.",
+            ),
+            (
+                "http_request_sql_statements",
+                "statements",
+                "Количество SQL-запросов.",
+            ),
+        ):
+            lines += format_histogram(
+                name,
+                description,
+                {
+                    labels[key]: getattr(metrics, attribute)
+                    for key, metrics in self.routes.items()
+                },
+            )
+        lines += [
+            "# HELP http_request_n_plus_one_total Запросы с подозрением на N+1.",
+            "# TYPE http_request_n_plus_one_total counter",
+        ]
+        lines += [
+            f"http_request_n_plus_one_total{{{labels[key]}}} {metrics.n_plus_one}"
+            for key, metrics in self.routes.items()
+        ]
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics(settings.REQUEST_METRICS_N_PLUS_ONE_THRESHOLD)
+
+
+def get_route_path(scope: Scope) -> str:
+    """
+    Возвращает шаблон пути маршрута, обработавшего запрос.
+
+    - **scope**: ASGI scope запроса.
+
+    """
+    for route in scope["app"].routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return UNMATCHED_ROUTE
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware, замеряющий количество и время SQL-запросов, время
+    сериализации и полное время обработки каждого запроса.
+
+    """
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics):
+        """
+        Создает middleware.
+
+        - **app**: Оборачиваемое ASGI-приложение.
+        - **metrics**: Реестр, в который сохраняются метрики запросов.
+
+        """
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Обрабатывает запрос, собирая его статистику."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        started_at = perf_counter()
+
+        async def send_with_server_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(
+                    "Server-Timing", stats.server_timing(perf_counter() - started_at)
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_server_timing)
+        finally:
+            request_stats.reset(token)
+            self.metrics.observe(
+                scope["method"],
+                get_route_path(scope),
+                stats,
+                perf_counter() - started_at,
+            )
+
+
+class InstrumentedRoute(APIRoute):
+    """Маршрут, замеряющий время сериализации ответа эндпоинта."""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        """
+        Создает маршрут, отмечающий момент завершения эндпоинта.
+
+        - **path**: Путь маршрута.
+        - **endpoint**: Асинхронная функция эндпоинта.
+
+        """
+
+        @wraps(endpoint)
+        async def timed_endpoint(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                stats = request_stats.get()
+                if stats is not None:
+                    stats.endpoint_finished_at = perf_counter()
+
+        super().__init__(path, timed_endpoint, **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        """Возвращает обработчик, замеряющий сериализацию ответа эндпоинта."""
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            response = await handler(request)
+            stats = request_stats.get()
+            if stats is not None and stats.endpoint_finished_at is not None:
+                stats.serialization_time = perf_counter() - stats.endpoint_finished_at
+            return response
+
+        return timed_handler
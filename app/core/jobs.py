@@ -0,0 +1,204 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.db.db import AsyncSessionLocal
+from app.core.db.models import OutboxJob
+
+logger = logging.getLogger(__name__)
+
+Job = tuple[str, dict[str, Any]]
+JobHandler = Callable[[dict[str, Any], AsyncSession], Awaitable[None]]
+
+job_handlers: dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """
+    Регистрирует обработчик фоновых задач заданного вида.
+
+    Задача может выполниться повторно, например после падения процесса
+    между выполнением и удалением задачи, поэтому обработчик должен быть
+    идемпотентным.
+
+    - **kind**: Вид задачи.
+
+    """
+
+    def register(handler: JobHandler) -> JobHandler:
+        job_handlers[kind] = handler
+        return handler
+
+    return register
+
+
+async def enqueue_jobs(jobs: list[Job], session: AsyncSession) -> None:
+    """
+    Записывает задачи в таблицу outbox одним запросом в текущей транзакции.
+
+    Задачи выполняются, только если транзакция будет зафиксирована.
+
+    - **jobs**: Пары (вид задачи, параметры задачи).
+    - **session**: Асинхронная сессия для работы с базой данных.
+
+    """
+    run_after = datetime.utcnow()
+    await session.execute(
+        insert(OutboxJob).values(
+            [
+                {"kind": kind, "payload": payload, "run_after": run_after}
+                for kind, payload in jobs
+            ]
+        )
+    )
+
+
+def get_retry_delay(attempts: int) -> float:
+    """
+    Возвращает задержку перед повторной попыткой с экспоненциальным ростом.
+
+    - **attempts**: Количество неудачных попыток.
+
+    """
+    return min(
+        settings.JOBS_RETRY_BASE_SECONDS * 2 ** (attempts - 1),
+        settings.JOBS_RETRY_MAX_SECONDS,
+    )
+
+
+class JobWorker:
+    """
+    Пул обработчиков задач из таблицы outbox внутри процесса приложения.
+
+    Каждый обработчик забирает пачку готовых задач, продлевая им срок
+    аренды, выполняет их и удаляет выполненные. Задачи, аренда которых истекла,
+    например после падения процесса, забираются снова. Неудачные задачи
+    повторяются с экспоненциальной задержкой; после JOBS_MAX_ATTEMPTS попыток
+    задача остается в таблице с пустым run_after и последней ошибкой.
+    """
+
+    def __init__(self, session_factory: sessionmaker):
+        """
+        Создает остановленный пул обработчиков.
+
+        - **session_factory**: Фабрика асинхронных сессий.
+
+        """
+        self.session_factory = session_factory
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def start(self, workers: int) -> None:
+        """
+        Запускает обработчики в текущем цикле событий.
+
+        - **workers**: Количество обработчиков.
+
+        """
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(workers)]
+
+    async def stop(self) -> None:
+        """Останавливает обработчики; незавершенные задачи выполнятся позже."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def wake(self) -> None:
+        """Будит обработчики после фиксации транзакции с новыми задачами."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def run_pending(self) -> int:
+        """Выполняет одну пачку готовых задач и возвращает их количество."""
+        async with self.session_factory() as session:
+            jobs = await self._claim(session)
+            for job in jobs:
+                await self._execute(job, session)
+        return len(jobs)
+
+    async def _run(self) -> None:
+        """Выполняет задачи, пока они есть, и ждет новых или опроса таблицы."""
+        while True:
+            try:
+                if await self.run_pending():
+                    continue
+            except Exception:
+                logger.exception("Не удалось получить задачи из outbox.")
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), settings.JOBS_POLL_INTERVAL_SECONDS
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def _claim(self, session: AsyncSession) -> list:
+        """
+        Забирает пачку готовых задач, пропуская задачи, заблокированные
+        другими обработчиками, и продлевает им срок аренды.
+
+        - **session**: Асинхронная сессия для работы с базой данных.
+
+        """
+        now = datetime.utcnow()
+        ready = (
+            select(OutboxJob.id)
+            .where(OutboxJob.run_after <= now)
+            .order_by(OutboxJob.run_after, OutboxJob.id)
+            .limit(settings.JOBS_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        jobs = await session.execute(
+            update(OutboxJob)
+            .where(OutboxJob.id.in_(ready))
+            .values(run_after=now + timedelta(seconds=settings.JOBS_LEASE_SECONDS))
+            .returning(
+                OutboxJob.id, OutboxJob.kind, OutboxJob.payload, OutboxJob.attempts
+            )
+            .execution_options(synchronize_session=False)
+        )
+        jobs = jobs.all()
+        await session.commit()
+        return jobs
+
+    async def _execute(self, job, session: AsyncSession) -> None:
+        """
+        Выполняет задачу и удаляет ее или откладывает до следующей попытки.
+
+        - **job**: Строка задачи (id, kind, payload, attempts).
+        - **session**: Асинхронная сессия для работы с базой данных.
+
+        """
+        try:
+            await job_handlers[job.kind](job.payload, session)
+        except Exception as error:
+            await session.rollback()
+            attempts = job.attempts + 1
+            run_after = None
+            if attempts < settings.JOBS_MAX_ATTEMPTS:
+                run_after = datetime.utcnow() + timedelta(
+                    seconds=get_retry_delay(attempts)
+                )
+            logger.exception(
+                "Задача %s (%s) не выполнена, попытка %s.", job.id, job.kind, attempts
+            )
+            await session.execute(
+                update(OutboxJob)
+                .where(OutboxJob.id == job.id)
+                .values(attempts=attempts, run_after=run_after, last_error=repr(error))
+                .execution_options(synchronize_session=False)
+            )
+        else:
+            await session.execute(delete(OutboxJob).where(OutboxJob.id == job.id))
+        await session.commit()
+
+
+job_worker = JobWorker(AsyncSessionLocal)
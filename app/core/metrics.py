@@ -0,0 +1,89 @@
+from bisect import bisect_left
+from typing import Any
+
+LATENCY_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Histogram:
+    """Гистограмма с фиксированными границами корзин в стиле Prometheus."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        """
+        Создает пустую гистограмму.
+
+        - **buckets**: Верхние границы корзин по возрастанию.
+
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """
+        Добавляет наблюдение в гистограмму.
+
+        - **value**: Наблюдаемое значение.
+
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """Возвращает накопительные значения корзин, сумму и количество."""
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        buckets["+Inf"] = self.count
+        return {"buckets": buckets, "sum": self.sum, "count": self.count}
+
+
+def format_histogram(
+    name: str, description: str, histograms: dict[str, Histogram]
+) -> list[str]:
+    """
+    Возвращает строки гистограмм в текстовом формате Prometheus.
+
+    - **name**: Название метрики.
+    - **description**: Описание метрики.
+    - **histograms**: Гистограммы по строкам меток вида `method="GET"`.
+
+    """
+    lines = [f"# HELP {name} {description}", f"# TYPE {name} histogram"]
+    for labels, histogram in histograms.items():
+        snapshot = histogram.snapshot()
+        for bound, count in snapshot["buckets"].items():
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+        lines.append(f"{name}_sum{{{labels}}} {snapshot['sum']}")
+        lines.append(f"{name}_count{{{labels}}} {snapshot['count']}")
+    return lines
+
+
+def format_counter(name: str, description: str, values: dict[str, int]) -> list[str]:
+    """
+    Возвращает строки счетчиков в текстовом формате Prometheus.
+
+    - **name**: Название метрики.
+    - **description**: Описание метрики.
+    - **values**: Значения счетчика по строкам меток вида `name="post"`.
+
+    """
+    lines = [f"# HELP {name} {description}", f"# TYPE {name} counter"]
+    lines += [f"{name}{{{labels}}} {value}" for labels, value in values.items()]
+    return lines
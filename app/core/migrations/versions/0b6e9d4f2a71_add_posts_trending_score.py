@@ -0,0 +1,30 @@
+"""add posts trending score
+
+Revision ID: 0b6e9d4f2a71
+Revises: f3a05b7c2d19
+Create Date: 2026-10-18 18:40:27.104215
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0b6e9d4f2a71"
+down_revision = "f3a05b7c2d19"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("posts", sa.Column("trending_score", sa.Float(), nullable=True))
+    op.create_index(
+        "ix_posts_trending_score_id",
+        "posts",
+        ["trending_score", "id"],
+        postgresql_where=sa.text("trending_score IS NOT NULL"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_posts_trending_score_id", table_name="posts")
+    op.drop_column("posts", "trending_score")
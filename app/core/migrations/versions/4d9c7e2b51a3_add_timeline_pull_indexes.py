@@ -0,0 +1,37 @@
+"""add timeline pull indexes
+
+Revision ID: 4d9c7e2b51a3
+Revises: b8e3d5a0c4f6
+Create Date: 2026-10-19 14:26:40.118392
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "4d9c7e2b51a3"
+down_revision = "b8e3d5a0c4f6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_users_followers_count", "users", ["followers_count"])
+    op.create_index(
+        "ix_posts_created_at_id_not_fanned_out",
+        "posts",
+        ["created_at", "id"],
+        postgresql_where=sa.text("NOT fanned_out"),
+    )
+    op.drop_index("ix_posts_author_id_created_at_id_not_fanned_out", table_name="posts")
+
+
+def downgrade():
+    op.create_index(
+        "ix_posts_author_id_created_at_id_not_fanned_out",
+        "posts",
+        ["author_id", "created_at", "id"],
+        postgresql_where=sa.text("NOT fanned_out"),
+    )
+    op.drop_index("ix_posts_created_at_id_not_fanned_out", table_name="posts")
+    op.drop_index("ix_users_followers_count", table_name="users")
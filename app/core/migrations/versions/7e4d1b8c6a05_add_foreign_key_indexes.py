@@ -0,0 +1,28 @@
+"""add foreign key indexes
+
+Revision ID: 7e4d1b8c6a05
+Revises: 5c7a2e91d3f8
+Create Date: 2026-10-18 21:35:02.671904
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7e4d1b8c6a05"
+down_revision = "5c7a2e91d3f8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_posts_author_id_created_at_id",
+        "posts",
+        ["author_id", "created_at", "id"],
+    )
+    op.create_index("ix_timeline_post_id", "timeline", ["post_id"])
+
+
+def downgrade():
+    op.drop_index("ix_timeline_post_id", table_name="timeline")
+    op.drop_index("ix_posts_author_id_created_at_id", table_name="posts")
@@ -0,0 +1,51 @@
+"""add outbox
+
+Revision ID: 9a2f6c3d1e84
+Revises: 7e4d1b8c6a05
+Create Date: 2026-10-18 22:48:37.215093
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9a2f6c3d1e84"
+down_revision = "7e4d1b8c6a05"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "outbox",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.Column("kind", sa.String(length=64), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("run_after", sa.TIMESTAMP(), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_outbox_run_after_id",
+        "outbox",
+        ["run_after", "id"],
+        postgresql_where=sa.text("run_after IS NOT NULL"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_outbox_run_after_id", table_name="outbox")
+    op.drop_table("outbox")
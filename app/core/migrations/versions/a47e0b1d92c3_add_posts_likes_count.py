@@ -0,0 +1,32 @@
+"""add posts likes_count
+
+Revision ID: a47e0b1d92c3
+Revises: 3f1c2a9d7b40
+Create Date: 2026-10-18 11:02:17.114930
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a47e0b1d92c3"
+down_revision = "3f1c2a9d7b40"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "posts",
+        sa.Column("likes_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute(
+        "UPDATE posts SET likes_count = counts.likes_count "
+        "FROM (SELECT post_id, count(*) AS likes_count FROM likes "
+        "GROUP BY post_id) AS counts "
+        "WHERE counts.post_id = posts.id"
+    )
+
+
+def downgrade():
+    op.drop_column("posts", "likes_count")
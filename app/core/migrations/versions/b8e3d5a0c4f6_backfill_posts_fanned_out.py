@@ -0,0 +1,27 @@
+"""backfill posts fanned out
+
+Revision ID: b8e3d5a0c4f6
+Revises: 9a2f6c3d1e84
+Create Date: 2026-10-19 10:14:52.806311
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b8e3d5a0c4f6"
+down_revision = "9a2f6c3d1e84"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Посты, созданные до появления ленты, получили fanned_out = false и без
+    # этого навсегда остались бы в частичном индексе постов, ожидающих
+    # рассылки. Правило не зависит от настроек: задача рассылки отмечает
+    # обработанными посты всех авторов, а посты, ожидающие задачи, будут
+    # разосланы ею повторно.
+    op.execute("UPDATE posts SET fanned_out = true WHERE NOT fanned_out")
+
+
+def downgrade():
+    pass
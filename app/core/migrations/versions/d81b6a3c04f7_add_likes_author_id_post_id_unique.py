@@ -0,0 +1,36 @@
+"""add likes author_id post_id unique
+
+Revision ID: d81b6a3c04f7
+Revises: c5d83f6e21a9
+Create Date: 2026-10-18 12:31:05.887142
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d81b6a3c04f7"
+down_revision = "c5d83f6e21a9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Duplicates could be inserted by concurrent requests before the
+    # constraint existed: keep the earliest like and fix the counters.
+    op.execute(
+        "DELETE FROM likes AS duplicate USING likes AS original "
+        "WHERE duplicate.author_id = original.author_id "
+        "AND duplicate.post_id = original.post_id "
+        "AND duplicate.id > original.id"
+    )
+    op.execute(
+        "UPDATE posts SET likes_count = "
+        "(SELECT count(*) FROM likes WHERE likes.post_id = posts.id)"
+    )
+    op.create_unique_constraint(
+        "uq_likes_author_id_post_id", "likes", ["author_id", "post_id"]
+    )
+
+
+def downgrade():
+    op.drop_constraint("uq_likes_author_id_post_id", "likes", type_="unique")
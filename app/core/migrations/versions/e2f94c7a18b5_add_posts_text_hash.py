@@ -0,0 +1,31 @@
+"""add posts text_hash
+
+Revision ID: e2f94c7a18b5
+Revises: d81b6a3c04f7
+Create Date: 2026-10-18 13:15:40.271658
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e2f94c7a18b5"
+down_revision = "d81b6a3c04f7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("posts", sa.Column("text_hash", sa.String(length=64), nullable=True))
+    op.execute(
+        "UPDATE posts SET text_hash = encode(sha256(convert_to(text, 'UTF8')), 'hex')"
+    )
+    op.alter_column("posts", "text_hash", nullable=False)
+    op.create_index(op.f("ix_posts_text_hash"), "posts", ["text_hash"], unique=True)
+    op.drop_constraint("posts_text_key", "posts", type_="unique")
+
+
+def downgrade():
+    op.create_unique_constraint("posts_text_key", "posts", ["text"])
+    op.drop_index(op.f("ix_posts_text_hash"), table_name="posts")
+    op.drop_column("posts", "text_hash")
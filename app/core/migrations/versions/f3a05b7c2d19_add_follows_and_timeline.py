@@ -0,0 +1,97 @@
+"""add follows and timeline
+
+Revision ID: f3a05b7c2d19
+Revises: e2f94c7a18b5
+Create Date: 2026-10-18 16:02:11.530482
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f3a05b7c2d19"
+down_revision = "e2f94c7a18b5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "users",
+        sa.Column("followers_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "posts",
+        sa.Column(
+            "fanned_out", sa.Boolean(), server_default=sa.false(), nullable=False
+        ),
+    )
+    op.create_index(
+        "ix_posts_author_id_created_at_id_not_fanned_out",
+        "posts",
+        ["author_id", "created_at", "id"],
+        postgresql_where=sa.text("NOT fanned_out"),
+    )
+    op.create_table(
+        "follows",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.Column("follower_id", sa.Integer(), nullable=False),
+        sa.Column("author_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["author_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["follower_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "follower_id", "author_id", name="uq_follows_follower_id_author_id"
+        ),
+    )
+    op.create_index("ix_follows_author_id", "follows", ["author_id"])
+    op.create_table(
+        "timeline",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("post_id", sa.Integer(), nullable=False),
+        sa.Column("post_created_at", sa.TIMESTAMP(), nullable=False),
+        sa.ForeignKeyConstraint(["post_id"], ["posts.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "post_id", name="uq_timeline_user_id_post_id"),
+    )
+    op.create_index(
+        "ix_timeline_user_id_post_created_at_post_id",
+        "timeline",
+        ["user_id", "post_created_at", "post_id"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_timeline_user_id_post_created_at_post_id", table_name="timeline")
+    op.drop_table("timeline")
+    op.drop_index("ix_follows_author_id", table_name="follows")
+    op.drop_table("follows")
+    op.drop_index("ix_posts_author_id_created_at_id_not_fanned_out", table_name="posts")
+    op.drop_column("posts", "fanned_out")
+    op.drop_column("users", "followers_count")
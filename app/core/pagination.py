@@ -0,0 +1,97 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional
+
+
+def _encode(values: list) -> str:
+    """
+    Кодирует значения позиции в списке в непрозрачную строку.
+
+    - **values**: Значения, сериализуемые в JSON.
+
+    """
+    raw = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> Any:
+    """
+    Декодирует строку, полученную из _encode.
+
+    - **cursor**: Курсор, полученный в поле `next_cursor`.
+
+    """
+    return json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+
+
+def encode_cursor(created_at: datetime, obj_id: int) -> str:
+    """
+    Кодирует позицию в списке в непрозрачный курсор.
+
+    - **created_at**: Дата создания последнего объекта на странице.
+    - **obj_id**: Идентификатор последнего объекта на странице.
+
+    """
+    return _encode([created_at.isoformat(), obj_id])
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Декодирует курсор в пару (created_at, id).
+
+    - **cursor**: Курсор, полученный в поле `next_cursor`.
+
+    Выбрасывает ValueError, если курсор поврежден.
+
+    """
+    try:
+        created_at, obj_id = _decode(cursor)
+        return datetime.fromisoformat(created_at), int(obj_id)
+    except (TypeError, ValueError) as error:
+        raise ValueError("Некорректный курсор.") from error
+
+
+def decode_rank_cursor(cursor: str) -> tuple[float, int]:
+    """
+    Декодирует курсор списка, упорядоченного по релевантности, в пару (rank, id).
+
+    - **cursor**: Курсор, полученный в поле `next_cursor`.
+
+    Выбрасывает ValueError, если курсор поврежден.
+
+    """
+    try:
+        rank, obj_id = _decode(cursor)
+        return float(rank), int(obj_id)
+    except (TypeError, ValueError) as error:
+        raise ValueError("Некорректный курсор.") from error
+
+
+def get_next_cursor(items: list[Any], limit: int) -> Optional[str]:
+    """
+    Возвращает курсор следующей страницы или None, если страница последняя.
+
+    - **items**: Объекты текущей страницы.
+    - **limit**: Запрошенный размер страницы.
+
+    """
+    if len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(last.created_at, last.id)
+
+
+def get_next_rank_cursor(items: list[Any], limit: int) -> Optional[str]:
+    """
+    Возвращает курсор следующей страницы списка, упорядоченного
+    по релевантности, или None, если страница последняя.
+
+    - **items**: Объекты текущей страницы с полем rank.
+    - **limit**: Запрошенный размер страницы.
+
+    """
+    if len(items) < limit:
+        return None
+    last = items[-1]
+    return _encode([last.rank, last.id])
@@ -0,0 +1,86 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Callable, Optional, TypeVar
+
+from fastapi import HTTPException
+from fastapi_users.password import PasswordHelper
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """Хеширование паролей bcrypt в ограниченном пуле потоков вне цикла событий."""
+
+    def __init__(self, rounds: int, workers: int, queue_size: int):
+        """
+        Создает пул потоков для хеширования паролей.
+
+        - **rounds**: Стоимость bcrypt (логарифм количества раундов).
+        - **workers**: Количество потоков, одновременно считающих хеши.
+        - **queue_size**: Сколько операций может ждать свободного потока.
+
+        """
+        self.helper = PasswordHelper(
+            CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hasher"
+        )
+        self._limit = workers + queue_size
+        self._pending = 0
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        """
+        Выполняет функцию в пуле потоков, если очередь не переполнена.
+
+        - **func**: Функция хеширования.
+        - **args**: Аргументы функции.
+
+        """
+        if self._pending >= self._limit:
+            raise HTTPException(
+                status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                detail="Сервер перегружен, повторите попытку позже.",
+                headers={"Retry-After": "1"},
+            )
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, func, *args
+            )
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        """
+        Хеширует пароль.
+
+        - **password**: Пароль в открытом виде.
+
+        """
+        return await self._run(self.helper.hash, password)
+
+    async def verify_and_update(
+        self, plain_password: str, hashed_password: str
+    ) -> tuple[bool, Optional[str]]:
+        """
+        Проверяет пароль и возвращает новый хеш, если старый устарел.
+
+        - **plain_password**: Пароль в открытом виде.
+        - **hashed_password**: Сохраненный хеш пароля.
+
+        """
+        return await self._run(
+            self.helper.verify_and_update, plain_password, hashed_password
+        )
+
+
+password_hasher = PasswordHasher(
+    settings.PASSWORD_BCRYPT_ROUNDS,
+    settings.PASSWORD_HASH_WORKERS,
+    settings.PASSWORD_HASH_QUEUE_SIZE,
+)
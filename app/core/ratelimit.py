@@ -0,0 +1,193 @@
+from collections import OrderedDict
+from http import HTTPStatus
+from math import ceil
+from time import monotonic
+from typing import Callable
+
+from fastapi import Depends, HTTPException, Request
+
+from app.core.config import settings
+from app.core.db.models import User
+from app.core.user import current_user
+
+TOO_MANY_REQUESTS = "Слишком много запросов, повторите позже."
+
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local time = redis.call("TIME")
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "updated_at")
+local tokens = burst
+if bucket[1] then
+    tokens = math.min(burst, tonumber(bucket[1]) + (now - tonumber(bucket[2])) * rate)
+end
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call("HSET", KEYS[1], "tokens", tokens, "updated_at", now)
+redis.call("PEXPIRE", KEYS[1], math.ceil(burst / rate * 1000))
+return tostring(retry_after)
+"""
+
+
+class RateLimitBackend:
+    """Хранилище ограничений, которое пропускает все запросы; базовый класс."""
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        """
+        Забирает жетон из ведра ключа и возвращает 0 или, если жетонов нет,
+        время в секундах до появления следующего жетона.
+
+        - **key**: Ключ ведра.
+        - **rate**: Скорость пополнения ведра в жетонах в секунду.
+        - **burst**: Вместимость ведра.
+
+        """
+        return 0.0
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    Хранилище ведер в памяти процесса с вытеснением LRU.
+
+    Каждое обращение выполняется за O(1). Вытесненное ведро при следующем
+    запросе создается полным, поэтому при переполнении хранилища давно
+    не обращавшиеся клиенты получают ограничение заново.
+    """
+
+    def __init__(self, max_keys: int):
+        """
+        Создает пустое хранилище.
+
+        - **max_keys**: Максимальное количество ведер в хранилище.
+
+        """
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        now = monotonic()
+        bucket = self._buckets.pop(key, None)
+        tokens = burst
+        if bucket is not None:
+            tokens = min(burst, bucket[0] + (now - bucket[1]) * rate)
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Общее для всех воркеров хранилище ведер в Redis."""
+
+    def __init__(self, url: str):
+        """
+        Подключается к Redis. Требует установленного пакета `redis`.
+
+        - **url**: Ссылка для подключения к Redis.
+
+        """
+        try:
+            from redis import asyncio as redis
+        except ImportError as error:
+            raise RuntimeError(
+                "Для RATE_LIMIT_BACKEND=redis установите пакет redis."
+            ) from error
+        self._redis = redis.from_url(url)
+        self._token_bucket = self._redis.register_script(TOKEN_BUCKET_SCRIPT)
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        retry_after = await self._token_bucket(
+            keys=[f"rate-limit:{key}"], args=[rate, burst]
+        )
+        return float(retry_after)
+
+
+def create_rate_limit_backend() -> RateLimitBackend:
+    """Создает хранилище ограничений, выбранное в настройках."""
+    if settings.RATE_LIMIT_BACKEND == "memory":
+        return MemoryRateLimitBackend(settings.RATE_LIMIT_MAX_KEYS)
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisRateLimitBackend(settings.RATE_LIMIT_URL)
+    return RateLimitBackend()
+
+
+rate_limit_backend = create_rate_limit_backend()
+
+
+def get_client_ip(request: Request) -> str:
+    """
+    Возвращает IP-адрес клиента: из заголовка X-Real-IP, который
+    выставляет nginx, если ему разрешено доверять, иначе адрес соединения.
+
+    - **request**: Текущий запрос.
+
+    """
+    if settings.RATE_LIMIT_TRUST_X_REAL_IP:
+        real_ip = request.headers.get("X-Real-IP")
+        if real_ip:
+            return real_ip
+    return request.client.host if request.client else "unknown"
+
+
+async def check_rate_limit(scope: str, key: str) -> None:
+    """
+    Проверяет ограничение частоты запросов к группе маршрутов.
+
+    Ограничение группы задается настройками RATE_LIMIT_<ГРУППА>_PER_MINUTE
+    и RATE_LIMIT_<ГРУППА>_BURST; нулевая частота снимает ограничение.
+
+    - **scope**: Группа маршрутов.
+    - **key**: Ключ клиента.
+
+    """
+    per_minute = getattr(settings, f"RATE_LIMIT_{scope.upper()}_PER_MINUTE")
+    burst = getattr(settings, f"RATE_LIMIT_{scope.upper()}_BURST")
+    if per_minute <= 0:
+        return
+    retry_after = await rate_limit_backend.acquire(
+        f"{scope}:{key}", per_minute / 60, burst
+    )
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=HTTPStatus.TOO_MANY_REQUESTS,
+            detail=TOO_MANY_REQUESTS,
+            headers={"Retry-After": str(ceil(retry_after))},
+        )
+
+
+def limit_by_user(scope: str) -> Callable:
+    """
+    Возвращает зависимость, ограничивающую частоту запросов пользователя.
+
+    - **scope**: Группа маршрутов.
+
+    """
+
+    async def dependency(user: User = Depends(current_user)) -> None:
+        await check_rate_limit(scope, f"user:{user.id}")
+
+    return dependency
+
+
+def limit_by_ip(scope: str) -> Callable:
+    """
+    Возвращает зависимость, ограничивающую частоту запросов с IP-адреса.
+
+    - **scope**: Группа маршрутов.
+
+    """
+
+    async def dependency(request: Request) -> None:
+        await check_rate_limit(scope, f"ip:{get_client_ip(request)}")
+
+    return dependency
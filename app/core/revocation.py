@@ -0,0 +1,104 @@
+from app.core.config import settings
+
+
+class TokenRevocationBackend:
+    """
+    Хранилище версий токенов, которое ничего не отзывает; базовый класс.
+
+    Версия токенов пользователя увеличивается при каждом отзыве, а токен
+    содержит версию на момент выдачи. Поэтому токен, выданный сразу после
+    отзыва, даже в ту же секунду, остается действительным, а все более
+    ранние токены - нет.
+    """
+
+    async def get_version(self, user_id: int) -> int:
+        """
+        Возвращает текущую версию токенов пользователя.
+
+        - **user_id**: Идентификатор пользователя.
+
+        """
+        return 0
+
+    async def revoke(self, user_id: int) -> None:
+        """
+        Отзывает все ранее выданные токены пользователя.
+
+        - **user_id**: Идентификатор пользователя.
+
+        """
+
+
+class MemoryTokenRevocationBackend(TokenRevocationBackend):
+    """
+    Хранилище версий токенов в памяти процесса.
+
+    Подходит только для отладки в одном процессе: отзыв не доходит до других
+    воркеров, а после перезапуска все версии снова равны нулю, и отозванные
+    до перезапуска токены снова становятся действительными. Версии не
+    вытесняются, поэтому хранилище растет с количеством пользователей,
+    токены которых отзывались.
+    """
+
+    def __init__(self):
+        """Создает пустое хранилище."""
+        self._versions: dict[int, int] = {}
+
+    async def get_version(self, user_id: int) -> int:
+        return self._versions.get(user_id, 0)
+
+    async def revoke(self, user_id: int) -> None:
+        self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+
+class RedisTokenRevocationBackend(TokenRevocationBackend):
+    """Общее для всех воркеров хранилище версий токенов в Redis."""
+
+    def __init__(self, url: str):
+        """
+        Подключается к Redis. Требует установленного пакета `redis`.
+
+        - **url**: Ссылка для подключения к Redis.
+
+        """
+        try:
+            from redis import asyncio as redis
+        except ImportError as error:
+            raise RuntimeError(
+                "Для AUTH_REVOCATION_BACKEND=redis установите пакет redis."
+            ) from error
+        self._redis = redis.from_url(url)
+
+    async def get_version(self, user_id: int) -> int:
+        version = await self._redis.get(f"token-version:{user_id}")
+        return 0 if version is None else int(version)
+
+    async def revoke(self, user_id: int) -> None:
+        await self._redis.incr(f"token-version:{user_id}")
+
+
+def create_token_revocation_backend() -> TokenRevocationBackend:
+    """
+    Создает хранилище версий токенов, выбранное в настройках.
+
+    Отказывается запускать приложение, если эндпоинты доверяют данным
+    из токена, а токены нельзя отозвать или отзыв теряется при перезапуске
+    (хранилище в памяти допускается только с DEBUG=True).
+
+    """
+    if settings.AUTH_REVOCATION_BACKEND == "redis":
+        return RedisTokenRevocationBackend(settings.AUTH_REVOCATION_URL)
+    if settings.AUTH_TRUST_TOKEN_CLAIMS and not (
+        settings.AUTH_REVOCATION_BACKEND == "memory" and settings.DEBUG
+    ):
+        raise RuntimeError(
+            "Для AUTH_TRUST_TOKEN_CLAIMS=True выберите хранилище отзыва токенов "
+            "AUTH_REVOCATION_BACKEND=redis: хранилище memory теряет отзывы "
+            "при перезапуске и допускается только с DEBUG=True."
+        )
+    if settings.AUTH_REVOCATION_BACKEND == "memory":
+        return MemoryTokenRevocationBackend()
+    return TokenRevocationBackend()
+
+
+token_revocation_backend = create_token_revocation_backend()
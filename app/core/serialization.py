@@ -0,0 +1,119 @@
+from typing import Any, Callable, Optional, Union
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+
+def serialize_user(user: Any) -> dict[str, Any]:
+    """
+    Возвращает поля схемы UserRead без валидации pydantic.
+
+    - **user**: Пользователь или строка с его колонками.
+
+    """
+    return {
+        "id": user.id,
+        "email": user.email,
+        "is_active": user.is_active,
+        "is_superuser": user.is_superuser,
+        "is_verified": user.is_verified,
+    }
+
+
+def serialize_post_detail(post: Any) -> dict[str, Any]:
+    """
+    Возвращает поля схемы PostDetailDB без валидации pydantic.
+
+    - **post**: Пост с автором или строка с его колонками.
+
+    """
+    return {
+        "text": post.text,
+        "id": post.id,
+        "created_at": post.created_at.date(),
+        "author": serialize_user(post.author),
+        "likes_count": post.likes_count,
+    }
+
+
+def serialize_post_feed(post: Any) -> dict[str, Any]:
+    """
+    Возвращает поля схемы PostFeedDB без валидации pydantic.
+
+    - **post**: Строка с колонками поста и отметкой лайка текущего пользователя.
+
+    """
+    return {**serialize_post_detail(post), "liked_by_me": post.liked_by_me}
+
+
+def serialize_like_detail(like: Any) -> dict[str, Any]:
+    """
+    Возвращает поля схемы LikeDetailDB без валидации pydantic.
+
+    - **like**: Лайк с автором или строка с его колонками.
+
+    """
+    return {
+        "id": like.id,
+        "author": serialize_user(like.author),
+        "created_at": like.created_at.date(),
+    }
+
+
+def serialize_object(
+    schema: type[BaseModel], obj: Any, serialize_item: Callable[[Any], dict]
+) -> Union[BaseModel, dict[str, Any]]:
+    """
+    Сериализует объект словарем из колонок, если включена быстрая
+    сериализация, или схемой pydantic.
+
+    - **schema**: Схема объекта.
+    - **obj**: Объект ответа.
+    - **serialize_item**: Функция быстрой сериализации объекта.
+
+    """
+    if settings.FAST_JSON_SERIALIZATION:
+        return serialize_item(obj)
+    return schema.from_orm(obj)
+
+
+def serialize_page(
+    schema: type[BaseModel],
+    items: list,
+    next_cursor: Optional[str],
+    serialize_item: Callable[[Any], dict],
+) -> Union[BaseModel, dict[str, Any]]:
+    """
+    Сериализует страницу ответа словарем из колонок, если включена быстрая
+    сериализация, или схемой pydantic.
+
+    - **schema**: Схема страницы.
+    - **items**: Объекты страницы.
+    - **next_cursor**: Курсор следующей страницы.
+    - **serialize_item**: Функция быстрой сериализации объекта.
+
+    """
+    if settings.FAST_JSON_SERIALIZATION:
+        return {
+            "items": [serialize_item(item) for item in items],
+            "next_cursor": next_cursor,
+        }
+    return schema(items=items, next_cursor=next_cursor)
+
+
+def render_response(data: Union[BaseModel, dict[str, Any]]) -> Response:
+    """
+    Возвращает готовый JSON-ответ, минуя повторную валидацию FastAPI.
+
+    Словари кодируются orjson, схемы pydantic - стандартным путем FastAPI.
+
+    - **data**: Данные ответа.
+
+    """
+    if isinstance(data, BaseModel):
+        return JSONResponse(jsonable_encoder(data))
+    return ORJSONResponse(data)
@@ -0,0 +1,87 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+from app.core.metrics import format_counter
+
+T = TypeVar("T")
+
+
+class FlightCancelled(Exception):
+    """Запрос, к которому присоединились ожидающие, был отменен."""
+
+
+class SingleFlight:
+    """
+    Объединяет одновременные одинаковые запросы внутри процесса.
+
+    Первый запрос с ключом выполняется, а запросы с тем же ключом,
+    пришедшие до его завершения, ждут и получают его результат или ошибку,
+    не занимая соединения с базой данных. Результат не сохраняется:
+    следующий запрос после завершения снова идет в базу данных.
+    """
+
+    def __init__(self, name: str):
+        """
+        Создает пустую группу запросов и регистрирует ее метрики.
+
+        - **name**: Название группы в метриках.
+
+        """
+        self.name = name
+        self.calls = 0
+        self.coalesced = 0
+        self._flights: dict[Hashable, asyncio.Future] = {}
+        single_flights.append(self)
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Выполняет запрос или присоединяется к такому же выполняющемуся.
+
+        Если выполнявший запрос был отменен, например при отключении клиента,
+        ожидающие повторяют запрос сами.
+
+        - **key**: Ключ запроса; запросы с равными ключами взаимозаменяемы.
+        - **call**: Функция, выполняющая запрос.
+
+        """
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(flight)
+            except FlightCancelled:
+                return await self.do(key, call)
+        flight = self._flights[key] = asyncio.get_running_loop().create_future()
+        self.calls += 1
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            flight.set_exception(FlightCancelled())
+            raise
+        except Exception as error:
+            flight.set_exception(error)
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            del self._flights[key]
+            if flight.done() and not flight.cancelled():
+                flight.exception()
+
+
+single_flights: list[SingleFlight] = []
+
+
+def render_single_flight_metrics() -> str:
+    """Возвращает счетчики всех групп запросов в текстовом формате Prometheus."""
+    lines = format_counter(
+        "single_flight_calls_total",
+        "Запросы, выполненные в базе данных.",
+        {f'name="{flight.name}"': flight.calls for flight in single_flights},
+    ) + format_counter(
+        "single_flight_coalesced_total",
+        "Запросы, получившие результат одновременного такого же запроса.",
+        {f'name="{flight.name}"': flight.coalesced for flight in single_flights},
+    )
+    return "\n".join(lines) + "\n"
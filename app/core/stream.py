@@ -0,0 +1,278 @@
+import asyncio
+import logging
+from typing import Any, Iterable, Optional
+
+import orjson
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+FEED_TOPIC = "feed"
+STREAM_CHANNEL = "stream"
+
+
+def post_topic(post_id: int) -> str:
+    """
+    Возвращает тему изменений поста.
+
+    - **post_id**: Идентификатор поста.
+
+    """
+    return f"post:{post_id}"
+
+
+def get_topics(post_ids: Iterable[int], feed: bool) -> list[str]:
+    """
+    Возвращает темы подписки на посты и на новые посты.
+
+    - **post_ids**: Идентификаторы постов.
+    - **feed**: Подписаться ли на новые посты.
+
+    """
+    topics = [post_topic(post_id) for post_id in post_ids]
+    if feed:
+        topics.append(FEED_TOPIC)
+    return topics
+
+
+class Subscriber:
+    """
+    Подписка одного соединения, накапливающая события до отправки клиенту.
+
+    События не ставятся в очередь: изменения количества лайков одного поста
+    складываются, а идентификаторы новых постов хранятся в ограниченном буфере.
+    Поэтому память соединения не растет, если клиент читает медленно,
+    а публикация события никогда не ждет клиента.
+    """
+
+    def __init__(self):
+        """Создает подписку без тем."""
+        self.topics: set[str] = set()
+        self._likes: dict[int, int] = {}
+        self._posts: list[int] = []
+        self._posts_overflow = False
+        self._ready = asyncio.Event()
+
+    def push(self, event: dict[str, Any]) -> None:
+        """
+        Добавляет событие к изменениям, ожидающим отправки.
+
+        - **event**: Событие из шины.
+
+        """
+        post_id = event["post_id"]
+        if event["topic"] == FEED_TOPIC:
+            if len(self._posts) >= settings.STREAM_MAX_PENDING_POSTS:
+                del self._posts[0]
+                self._posts_overflow = True
+            self._posts.append(post_id)
+        else:
+            self._likes[post_id] = self._likes.get(post_id, 0) + event["delta"]
+        self._ready.set()
+
+    async def next_batch(self, timeout: float) -> Optional[dict[str, Any]]:
+        """
+        Ждет изменений и возвращает их одной пачкой.
+
+        После первого события подписка ждет STREAM_BATCH_SECONDS, чтобы
+        объединить события, пришедшие следом. Возвращает None, если за время
+        ожидания изменений не было или они взаимно погасились.
+
+        - **timeout**: Максимальное время ожидания первого события в секундах.
+
+        """
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        await asyncio.sleep(settings.STREAM_BATCH_SECONDS)
+        self._ready.clear()
+        likes = [
+            {"post_id": post_id, "delta": delta}
+            for post_id, delta in self._likes.items()
+            if delta
+        ]
+        batch = {
+            "likes": likes,
+            "posts": self._posts,
+            "posts_overflow": self._posts_overflow,
+        }
+        self._likes, self._posts, self._posts_overflow = {}, [], False
+        if not likes and not batch["posts"]:
+            return None
+        return batch
+
+
+class StreamHub:
+    """Подписки соединений текущего процесса по темам."""
+
+    def __init__(self):
+        """Создает хаб без подписок."""
+        self._subscribers: dict[str, set[Subscriber]] = {}
+
+    def subscribe(self, subscriber: Subscriber, topics: Iterable[str]) -> None:
+        """
+        Подписывает соединение на темы.
+
+        - **subscriber**: Подписка соединения.
+        - **topics**: Темы.
+
+        """
+        for topic in topics:
+            self._subscribers.setdefault(topic, set()).add(subscriber)
+            subscriber.topics.add(topic)
+
+    def unsubscribe(
+        self, subscriber: Subscriber, topics: Optional[Iterable[str]] = None
+    ) -> None:
+        """
+        Отписывает соединение от тем.
+
+        - **subscriber**: Подписка соединения.
+        - **topics**: Темы (по умолчанию все темы соединения).
+
+        """
+        for topic in list(subscriber.topics if topics is None else topics):
+            subscribers = self._subscribers.get(topic)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[topic]
+            subscriber.topics.discard(topic)
+
+    def dispatch(self, events: Iterable[dict[str, Any]]) -> None:
+        """
+        Передает события подпискам на их темы.
+
+        - **events**: События из шины.
+
+        """
+        for event in events:
+            for subscriber in self._subscribers.get(event["topic"], ()):
+                subscriber.push(event)
+
+
+class StreamBus:
+    """Шина событий в пределах процесса; базовый класс шин."""
+
+    def __init__(self, hub: StreamHub):
+        """
+        Создает шину, доставляющую события в хаб.
+
+        - **hub**: Хаб подписок текущего процесса.
+
+        """
+        self.hub = hub
+
+    async def start(self) -> None:
+        """Начинает получать события других процессов."""
+
+    async def stop(self) -> None:
+        """Прекращает получать события других процессов."""
+
+    async def publish(self, events: list[dict[str, Any]]) -> None:
+        """
+        Публикует события для подписчиков всех процессов.
+
+        - **events**: События.
+
+        """
+        self.hub.dispatch(events)
+
+
+class RedisStreamBus(StreamBus):
+    """Шина событий между воркерами через Redis Pub/Sub."""
+
+    def __init__(self, hub: StreamHub, url: str):
+        """
+        Подключается к Redis. Требует установленного пакета `redis`.
+
+        - **hub**: Хаб подписок текущего процесса.
+        - **url**: Ссылка для подключения к Redis.
+
+        """
+        super().__init__(hub)
+        try:
+            from redis import asyncio as redis
+        except ImportError as error:
+            raise RuntimeError(
+                "Для STREAM_BUS_BACKEND=redis установите пакет redis."
+            ) from error
+        self._redis = redis.from_url(url)
+        self._pubsub = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._pubsub = self._redis.pubsub()
+        await self._pubsub.subscribe(STREAM_CHANNEL)
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._pubsub is not None:
+            await self._pubsub.reset()
+            self._pubsub = None
+
+    async def publish(self, events: list[dict[str, Any]]) -> None:
+        await self._redis.publish(STREAM_CHANNEL, orjson.dumps(events))
+
+    async def _listen(self) -> None:
+        """Передает в хаб события, опубликованные любым воркером."""
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    if message["type"] == "message":
+                        self.hub.dispatch(orjson.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Не удалось получить события из Redis.")
+                await asyncio.sleep(settings.STREAM_HEARTBEAT_SECONDS)
+
+
+def create_stream_bus(hub: StreamHub) -> StreamBus:
+    """
+    Создает шину событий, выбранную в настройках.
+
+    - **hub**: Хаб подписок текущего процесса.
+
+    """
+    if settings.STREAM_BUS_BACKEND == "redis":
+        return RedisStreamBus(hub, settings.STREAM_BUS_URL)
+    return StreamBus(hub)
+
+
+stream_hub = StreamHub()
+stream_bus = create_stream_bus(stream_hub)
+
+
+async def publish_likes(post_ids: Iterable[int], delta: int) -> None:
+    """
+    Публикует изменение количества лайков постов.
+
+    - **post_ids**: Идентификаторы постов.
+    - **delta**: Изменение количества лайков каждого поста.
+
+    """
+    events = [
+        {"topic": post_topic(post_id), "post_id": post_id, "delta": delta}
+        for post_id in post_ids
+    ]
+    if events:
+        await stream_bus.publish(events)
+
+
+async def publish_new_posts(post_ids: Iterable[int]) -> None:
+    """
+    Публикует появление новых постов в общей ленте.
+
+    - **post_ids**: Идентификаторы новых постов.
+
+    """
+    events = [{"topic": FEED_TOPIC, "post_id": post_id} for post_id in post_ids]
+    if events:
+        await stream_bus.publish(events)
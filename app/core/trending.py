@@ -0,0 +1,62 @@
+from datetime import datetime
+from math import log
+
+from sqlalchemy import func
+from sqlalchemy.sql.expression import ColumnElement
+
+from app.core.config import settings
+
+SCORE_EPOCH = datetime(2020, 1, 1)
+MIN_SCORE_REMAINDER = 1e-12
+
+
+def get_decay_rate() -> float:
+    """Возвращает скорость затухания веса лайка в секунду."""
+    return log(2) / (settings.TRENDING_HALF_LIFE_HOURS * 3600)
+
+
+def get_like_weight(liked_at: datetime) -> float:
+    """
+    Возвращает натуральный логарифм веса лайка.
+
+    Вес лайка растет экспоненциально со временем его появления, поэтому
+    отношение весов двух лайков не зависит от текущего момента. Сумма весов
+    лайков поста, деленная на вес лайка в текущий момент, - это количество
+    лайков с затуханием по периоду полураспада TRENDING_HALF_LIFE_HOURS.
+    Порядок постов по сумме весов совпадает с порядком по затухающему
+    количеству лайков в любой момент, поэтому рейтинг не нужно пересчитывать
+    с течением времени. Веса хранятся логарифмами, чтобы не переполнять float.
+
+    - **liked_at**: Время появления лайка.
+
+    """
+    return get_decay_rate() * (liked_at - SCORE_EPOCH).total_seconds()
+
+
+def add_like_weight(score: ColumnElement, weight: float) -> ColumnElement:
+    """
+    Строит выражение логарифма суммы весов после добавления лайка.
+
+    - **score**: Логарифм суммы весов лайков.
+    - **weight**: Логарифм веса добавляемого лайка.
+
+    """
+    return func.greatest(score, weight) + func.ln(
+        1 + func.exp(-func.abs(score - weight))
+    )
+
+
+def remove_like_weight(score: ColumnElement, weight: float) -> ColumnElement:
+    """
+    Строит выражение логарифма суммы весов после удаления лайка.
+
+    Остаток суммы ограничен снизу, чтобы ошибки округления не приводили
+    к логарифму нуля.
+
+    - **score**: Логарифм суммы весов лайков.
+    - **weight**: Логарифм веса удаляемого лайка.
+
+    """
+    return score + func.ln(
+        func.greatest(1 - func.exp(weight - score), MIN_SCORE_REMAINDER)
+    )
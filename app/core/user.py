@@ -1,25 +1,38 @@
-from typing import Optional, Union
+import logging
+from http import HTTPStatus
+from typing import Any, Optional, Union
 
-from fastapi import Depends, Request
+import jwt
+from fastapi import Depends, HTTPException, Request
+from fastapi.security import OAuth2PasswordRequestForm
 from fastapi_users import (
     BaseUserManager,
     FastAPIUsers,
     IntegerIDMixin,
     InvalidPasswordException,
+    exceptions,
 )
 from fastapi_users.authentication import (
     AuthenticationBackend,
     BearerTransport,
     JWTStrategy,
 )
+from fastapi_users.jwt import decode_jwt, generate_jwt
 from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.db.db import get_async_session
 from app.core.db.models import User
+from app.core.jobs import enqueue_jobs, job_handler, job_worker
+from app.core.password import password_hasher
+from app.core.revocation import token_revocation_backend
 from app.schemas.user import UserCreate
 
+logger = logging.getLogger(__name__)
+
+USER_REGISTERED_JOB = "user_registered"
+
 
 async def get_user_db(session: AsyncSession = Depends(get_async_session)):
     """
@@ -34,9 +47,55 @@ async def get_user_db(session: AsyncSession = Depends(get_async_session)):
 bearer_transport = BearerTransport(tokenUrl="auth/jwt/login")
 
 
+class ClaimsJWTStrategy(JWTStrategy):
+    """Стратегия JWT, записывающая в токен данные пользователя для эндпоинтов."""
+
+    async def write_token(self, user: User) -> str:
+        """
+        Создает токен с идентификатором, статусами пользователя и текущей
+        версией его токенов.
+
+        - **user**: Пользователь, для которого создается токен.
+
+        """
+        data = {
+            "user_id": str(user.id),
+            "aud": self.token_audience,
+            "token_version": await token_revocation_backend.get_version(user.id),
+            "is_active": user.is_active,
+            "is_superuser": user.is_superuser,
+        }
+        return generate_jwt(
+            data, self.encode_key, self.lifetime_seconds, algorithm=self.algorithm
+        )
+
+
 def get_jwt_strategy() -> JWTStrategy:
     """Возвращает стратегию JWT."""
-    return JWTStrategy(secret=settings.SECRET, lifetime_seconds=3600)
+    return ClaimsJWTStrategy(
+        secret=settings.SECRET, lifetime_seconds=settings.AUTH_TOKEN_LIFETIME_SECONDS
+    )
+
+
+async def revoke_user_tokens(user_id: int) -> None:
+    """
+    Отзывает все ранее выданные токены пользователя.
+
+    - **user_id**: Идентификатор пользователя.
+
+    """
+    await token_revocation_backend.revoke(user_id)
+
+
+async def is_token_revoked(claims: dict[str, Any]) -> bool:
+    """
+    Проверяет, выдан ли токен до отзыва токенов пользователя.
+
+    - **claims**: Данные из токена.
+
+    """
+    version = await token_revocation_backend.get_version(int(claims["user_id"]))
+    return claims["token_version"] < version
 
 
 auth_backend = AuthenticationBackend(
@@ -47,7 +106,86 @@ auth_backend = AuthenticationBackend(
 
 
 class UserManager(IntegerIDMixin, BaseUserManager[User, int]):
-    """Менеджер пользователей для операций CRUD."""
+    """
+    Менеджер пользователей для операций CRUD.
+
+    Пароли хешируются и проверяются в пуле потоков `password_hasher`,
+    чтобы bcrypt не блокировал цикл событий.
+
+    """
+
+    async def create(
+        self,
+        user_create: UserCreate,
+        safe: bool = False,
+        request: Optional[Request] = None,
+    ) -> User:
+        """
+        Создает пользователя в базе данных. Задача о регистрации записывается
+        в outbox в той же транзакции.
+
+        - **user_create**: Данные для создания пользователя.
+        - **safe**: Игнорировать ли поля is_superuser и is_verified.
+        - **request**: Запрос, если есть (опционально).
+
+        """
+        await self.validate_password(user_create.password, user_create)
+        existing_user = await self.user_db.get_by_email(user_create.email)
+        if existing_user is not None:
+            raise exceptions.UserAlreadyExists()
+        user_dict = (
+            user_create.create_update_dict()
+            if safe
+            else user_create.create_update_dict_superuser()
+        )
+        password = user_dict.pop("password")
+        user_dict["hashed_password"] = await password_hasher.hash(password)
+        await enqueue_jobs(
+            [(USER_REGISTERED_JOB, {"email": user_dict["email"]})],
+            self.user_db.session,
+        )
+        created_user = await self.user_db.create(user_dict)
+        await self.on_after_register(created_user, request)
+        return created_user
+
+    async def authenticate(
+        self, credentials: OAuth2PasswordRequestForm
+    ) -> Optional[User]:
+        """
+        Аутентифицирует пользователя по e-mail и паролю.
+
+        - **credentials**: E-mail и пароль пользователя.
+
+        """
+        try:
+            user = await self.get_by_email(credentials.username)
+        except exceptions.UserNotExists:
+            # Хеширование выравнивает время ответа для несуществующих e-mail.
+            await password_hasher.hash(credentials.password)
+            return None
+        verified, updated_password_hash = await password_hasher.verify_and_update(
+            credentials.password, user.hashed_password
+        )
+        if not verified:
+            return None
+        if updated_password_hash is not None:
+            await self.user_db.update(user, {"hashed_password": updated_password_hash})
+        return user
+
+    async def _update(self, user: User, update_dict: dict[str, Any]) -> User:
+        """
+        Обновляет пользователя, хешируя новый пароль вне цикла событий.
+
+        - **user**: Обновляемый пользователь.
+        - **update_dict**: Обновляемые поля пользователя.
+
+        """
+        if "password" in update_dict:
+            update_dict = dict(update_dict)
+            password = update_dict.pop("password")
+            await self.validate_password(password, user)
+            update_dict["hashed_password"] = await password_hasher.hash(password)
+        return await super()._update(user, update_dict)
 
     async def validate_password(
         self,
@@ -72,11 +210,67 @@ class UserManager(IntegerIDMixin, BaseUserManager[User, int]):
         """
         Вызывается после успешной регистрации пользователя.
 
+        Побочные действия регистрации выполняются в фоне обработчиком задачи
+        USER_REGISTERED_JOB, записанной вместе с пользователем.
+
         - **user**: Зарегистрированный пользователь.
         - **request**: Запрос, если есть (опционально).
 
         """
-        print(f"Пользователь {user.email} зарегистрирован.")
+        job_worker.wake()
+
+    async def on_after_update(
+        self,
+        user: User,
+        update_dict: dict[str, Any],
+        request: Optional[Request] = None,
+    ):
+        """
+        Вызывается после обновления пользователя. Отзывает его токены,
+        если изменились пароль или данные, записанные в токен.
+
+        - **user**: Обновленный пользователь.
+        - **update_dict**: Обновленные поля пользователя.
+        - **request**: Запрос, если есть (опционально).
+
+        """
+        if update_dict.keys() & {"password", "is_active", "is_superuser"}:
+            await revoke_user_tokens(user.id)
+
+    async def on_after_reset_password(
+        self, user: User, request: Optional[Request] = None
+    ):
+        """
+        Вызывается после сброса пароля. Отзывает токены пользователя.
+
+        - **user**: Пользователь, сбросивший пароль.
+        - **request**: Запрос, если есть (опционально).
+
+        """
+        await revoke_user_tokens(user.id)
+
+    async def delete(self, user: User) -> None:
+        """
+        Удаляет пользователя и отзывает его токены, чтобы запросы
+        с ними не ссылались на удаленного пользователя.
+
+        - **user**: Удаляемый пользователь.
+
+        """
+        await super().delete(user)
+        await revoke_user_tokens(user.id)
+
+
+@job_handler(USER_REGISTERED_JOB)
+async def user_registered(payload: dict, session: AsyncSession) -> None:
+    """
+    Выполняет побочные действия регистрации пользователя.
+
+    - **payload**: Параметры задачи с e-mail пользователя.
+    - **session**: Асинхронная сессия для работы с базой данных.
+
+    """
+    logger.info("Пользователь %s зарегистрирован.", payload["email"])
 
 
 async def get_user_manager(user_db=Depends(get_user_db)):
@@ -86,7 +280,7 @@ async def get_user_manager(user_db=Depends(get_user_db)):
     - **user_db**: База данных пользователей.
 
     """
-    yield UserManager(user_db)
+    yield UserManager(user_db, password_hasher.helper)
 
 
 fastapi_users = FastAPIUsers[User, int](
@@ -94,5 +288,58 @@ fastapi_users = FastAPIUsers[User, int](
     [auth_backend],
 )
 
-current_user = fastapi_users.current_user(active=True)
+
+async def get_optional_user_from_token_claims(
+    token: Optional[str] = Depends(bearer_transport.scheme),
+) -> Optional[User]:
+    """
+    Получает активного пользователя из данных токена без запроса к базе данных.
+
+    Для запроса без токена, а также для токенов отозванных
+    или деактивированных пользователей возвращает None.
+
+    - **token**: JWT-токен из заголовка Authorization.
+
+    """
+    claims = {}
+    if token is not None:
+        try:
+            claims = decode_jwt(token, settings.SECRET, ["fastapi-users:auth"])
+        except jwt.PyJWTError:
+            pass
+    if (
+        not claims.get("is_active")
+        or not claims.keys() >= {"user_id", "token_version", "is_superuser"}
+        or await is_token_revoked(claims)
+    ):
+        return None
+    return User(
+        id=int(claims["user_id"]),
+        is_active=True,
+        is_superuser=claims["is_superuser"],
+    )
+
+
+async def get_user_from_token_claims(
+    user: Optional[User] = Depends(get_optional_user_from_token_claims),
+) -> User:
+    """
+    Получает активного пользователя из данных токена без запроса к базе данных.
+
+    Токены отозванных или деактивированных пользователей отклоняются.
+
+    - **user**: Пользователь из данных токена.
+
+    """
+    if user is None:
+        raise HTTPException(status_code=HTTPStatus.UNAUTHORIZED)
+    return user
+
+
+if settings.AUTH_TRUST_TOKEN_CLAIMS:
+    current_user = get_user_from_token_claims
+    optional_current_user = get_optional_user_from_token_claims
+else:
+    current_user = fastapi_users.current_user(active=True)
+    optional_current_user = fastapi_users.current_user(active=True, optional=True)
 current_superuser = fastapi_users.current_user(active=True, superuser=True)
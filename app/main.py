@@ -2,7 +2,44 @@ from fastapi import FastAPI
 
 from app.api.routers import main_router
 from app.core.config import settings
+from app.core.db.db import engine, replica_router
+from app.core.instrumentation import (
+    RequestMetricsMiddleware,
+    listen_engines,
+    request_metrics,
+)
+from app.core.jobs import job_worker
+from app.core.stream import stream_bus
 
 app = FastAPI(title=settings.APP_TITLE)
 
 app.include_router(main_router)
+
+if settings.REQUEST_METRICS_ENABLED:
+    listen_engines([engine] + [replica.engine for replica in replica_router.replicas])
+    app.add_middleware(RequestMetricsMiddleware, metrics=request_metrics)
+
+
+@app.on_event("startup")
+async def start_job_worker():
+    """Запускает обработчики фоновых задач."""
+    if settings.JOBS_WORKERS > 0:
+        job_worker.start(settings.JOBS_WORKERS)
+
+
+@app.on_event("startup")
+async def start_stream_bus():
+    """Подключает шину событий потока."""
+    await stream_bus.start()
+
+
+@app.on_event("shutdown")
+async def stop_job_worker():
+    """Останавливает обработчики фоновых задач."""
+    await job_worker.stop()
+
+
+@app.on_event("shutdown")
+async def stop_stream_bus():
+    """Отключает шину событий потока."""
+    await stream_bus.stop()
@@ -0,0 +1,18 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class BulkItemResult(BaseModel):
+    """Схема для отображения результата создания одного объекта из пачки."""
+
+    index: int
+    id: Optional[int]
+    error: Optional[str]
+
+
+class BulkResult(BaseModel):
+    """Схема для отображения результата создания пачки объектов."""
+
+    created: int
+    items: list[BulkItemResult]
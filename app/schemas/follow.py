@@ -0,0 +1,14 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+
+class FollowDB(BaseModel):
+    """Схема для отображения информации о подписке (Follow)."""
+
+    id: int
+    author_id: int
+    created_at: date
+
+    class Config:
+        orm_mode = True
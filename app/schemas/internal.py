@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+
+
+class HistogramDB(BaseModel):
+    """Схема для отображения гистограммы."""
+
+    buckets: dict[str, int]
+    sum: float
+    count: int
+
+
+class PoolStatsDB(BaseModel):
+    """Схема для отображения состояния пула соединений с базой данных."""
+
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkout_wait: HistogramDB
@@ -1,7 +1,9 @@
 from datetime import date
+from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, conlist
 
+from app.core.config import settings
 from app.schemas.user import UserRead
 
 
@@ -24,3 +26,16 @@ class LikeDetailDB(BaseModel):
 
     class Config:
         orm_mode = True
+
+
+class LikeDetailPage(BaseModel):
+    """Схема для отображения страницы лайков с курсором следующей страницы."""
+
+    items: list[LikeDetailDB]
+    next_cursor: Optional[str]
+
+
+class LikeBulkCreate(BaseModel):
+    """Схема для создания лайков (Like) на нескольких постах."""
+
+    items: conlist(int, min_items=1, max_items=settings.BULK_MAX_ITEMS)
@@ -1,8 +1,9 @@
 from datetime import date
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, conlist
 
+from app.core.config import settings
 from app.schemas.user import UserRead
 
 
@@ -36,3 +37,34 @@ class PostDetailDB(PostDB):
 
     class Config:
         orm_mode = True
+
+
+class PostDetailPage(BaseModel):
+    """Схема для отображения страницы постов с курсором следующей страницы."""
+
+    items: list[PostDetailDB]
+    next_cursor: Optional[str]
+
+
+class PostFeedDB(PostDetailDB):
+    """
+    Схема для отображения поста в ленте с отметкой лайка текущего пользователя.
+    """
+
+    liked_by_me: Optional[bool]
+
+    class Config:
+        orm_mode = True
+
+
+class PostFeedPage(BaseModel):
+    """Схема для отображения страницы ленты с курсором следующей страницы."""
+
+    items: list[PostFeedDB]
+    next_cursor: Optional[str]
+
+
+class PostBulkCreate(BaseModel):
+    """Схема для создания нескольких постов (Post)."""
+
+    items: conlist(PostCreate, min_items=1, max_items=settings.BULK_MAX_ITEMS)
@@ -0,0 +1,11 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class StreamCommand(BaseModel):
+    """Схема для изменения подписок соединения WebSocket."""
+
+    action: Literal["subscribe", "unsubscribe"]
+    posts: list[int] = []
+    feed: bool = False
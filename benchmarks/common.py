@@ -0,0 +1,90 @@
+from contextvars import ContextVar
+from statistics import quantiles
+from typing import Any, Awaitable, Optional
+
+import httpx
+from sqlalchemy import event
+
+from app.core.db import db
+from app.main import app
+
+statements: ContextVar[Optional[list[int]]] = ContextVar("statements", default=None)
+
+
+def count_statement(*args) -> None:
+    """Увеличивает счетчик SQL-запросов текущей задачи, если он установлен."""
+    counter = statements.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def listen_statements() -> None:
+    """Подсчитывает SQL-запросы основной базы данных и реплик."""
+    engines = [db.engine] + [replica.engine for replica in db.replica_router.replicas]
+    for engine in engines:
+        event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+
+
+async def count_statements(operation: Awaitable) -> tuple[Any, int]:
+    """
+    Выполняет операцию и возвращает ее результат и количество SQL-запросов.
+
+    - **operation**: Выполняемая операция.
+
+    """
+    counter = [0]
+    token = statements.set(counter)
+    try:
+        return await operation, counter[0]
+    finally:
+        statements.reset(token)
+
+
+def summarize(latencies: list[float], elapsed: float) -> dict[str, Any]:
+    """
+    Считает пропускную способность и перцентили задержки.
+
+    - **latencies**: Задержки запросов в секундах.
+    - **elapsed**: Длительность замера в секундах.
+
+    """
+    if len(latencies) < 2:
+        return {"requests": len(latencies), "rps": len(latencies) / elapsed}
+    cuts = quantiles(latencies, n=100, method="inclusive")
+    return {
+        "requests": len(latencies),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(cuts[49] * 1000, 2),
+        "p95_ms": round(cuts[94] * 1000, 2),
+        "p99_ms": round(cuts[98] * 1000, 2),
+    }
+
+
+def create_client(base_url: Optional[str] = None) -> httpx.AsyncClient:
+    """
+    Создает клиент к приложению: внутри процесса через ASGI
+    или к запущенному серверу, если передан адрес.
+
+    - **base_url**: Адрес запущенного сервера (опционально).
+
+    """
+    if base_url is not None:
+        return httpx.AsyncClient(base_url=base_url, timeout=60)
+    return httpx.AsyncClient(app=app, base_url="http://benchmark", timeout=60)
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> dict:
+    """
+    Регистрирует пользователя, если его еще нет, и возвращает заголовок авторизации.
+
+    - **client**: Клиент к приложению.
+    - **email**: E-mail пользователя.
+    - **password**: Пароль пользователя.
+
+    """
+    await client.post("/auth/register", json={"email": email, "password": password})
+    response = await client.post(
+        "/auth/jwt/login", data={"username": email, "password": password}
+    )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
@@ -0,0 +1,119 @@
+"""
+Одновременное чтение одного поста множеством запросов (thundering herd).
+
+Запуск: `python -m benchmarks.herd [--concurrency 200] [--waves 20]`.
+Используется база данных из настроек. Каждая волна - `--concurrency`
+одновременных чтений одного поста, каждое в своей читающей сессии, как в
+запросах `GET /posts/{post_id}` при промахе кэша: на реплике, если реплики
+настроены в DB_REPLICA_URLS, иначе на основной базе данных. Отчет сравнивает
+чтение без объединения запросов и с ним: задержку, количество SQL-запросов,
+наибольшее количество занятых соединений пулов и объединенные запросы.
+
+"""
+import argparse
+import asyncio
+import json
+import random
+from time import perf_counter, time
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.crud.post import post_crud, post_detail_reads
+from app.core.db.db import engine, open_read_session, replica_router
+from benchmarks.common import listen_statements, statements, summarize
+from benchmarks.seed import seed
+
+
+class PoolUsage:
+    """
+    Наибольшее количество одновременно занятых соединений пулов основной
+    базы данных и реплик.
+    """
+
+    def __init__(self):
+        """Создает счетчик и подписывается на выдачу и возврат соединений."""
+        self.checked_out = 0
+        self.peak = 0
+        engines = [engine] + [replica.engine for replica in replica_router.replicas]
+        for async_engine in engines:
+            event.listen(async_engine.sync_engine, "checkout", self.on_checkout)
+            event.listen(async_engine.sync_engine, "checkin", self.on_checkin)
+
+    def on_checkout(self, *args) -> None:
+        """Учитывает выданное соединение."""
+        self.checked_out += 1
+        self.peak = max(self.peak, self.checked_out)
+
+    def on_checkin(self, *args) -> None:
+        """Учитывает возвращенное соединение."""
+        self.checked_out -= 1
+
+
+async def read_post(post_id: int, latencies: list[float]) -> None:
+    """
+    Читает пост с автором в отдельной читающей сессии и записывает задержку.
+
+    - **post_id**: Идентификатор поста.
+    - **latencies**: Задержки чтений в секундах.
+
+    """
+    started_at = perf_counter()
+    async with open_read_session() as session:
+        await post_crud.get_post_with_author_by_id(post_id, session)
+    latencies.append(perf_counter() - started_at)
+
+
+async def run_phase(
+    post_id: int, concurrency: int, waves: int, enabled: bool, pool: PoolUsage
+) -> dict:
+    """
+    Запускает волны одновременных чтений одного поста.
+
+    - **post_id**: Идентификатор поста.
+    - **concurrency**: Количество одновременных чтений в волне.
+    - **waves**: Количество волн.
+    - **enabled**: Объединять ли одновременные чтения.
+    - **pool**: Счетчик занятых соединений пула.
+
+    """
+    settings.SINGLE_FLIGHT_ENABLED = enabled
+    latencies, counter = [], [0]
+    coalesced = post_detail_reads.coalesced
+    pool.peak = pool.checked_out
+    statements.set(counter)
+    started_at = perf_counter()
+    for _ in range(waves):
+        await asyncio.gather(
+            *(read_post(post_id, latencies) for _ in range(concurrency))
+        )
+    elapsed = perf_counter() - started_at
+    statements.set(None)
+    return {
+        **summarize(latencies, elapsed),
+        "sql_statements": counter[0],
+        "peak_pool_connections": pool.peak,
+        "coalesced": post_detail_reads.coalesced - coalesced,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Наполняет базу данных и сравнивает чтение поста без объединения и с ним."""
+    prefix = f"herd-{int(time())}"
+    seeded = await seed(1, 1, 0, 1.0, random.Random(0), prefix)
+    post_id = seeded["post_ids"][0]
+    listen_statements()
+    pool = PoolUsage()
+    result = {"config": vars(args)}
+    for name, enabled in (("without_single_flight", False), ("single_flight", True)):
+        result[name] = await run_phase(
+            post_id, args.concurrency, args.waves, enabled, pool
+        )
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--waves", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
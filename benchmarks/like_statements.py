@@ -0,0 +1,69 @@
+"""
+Проверка количества SQL-запросов при чтении лайков поста.
+
+Запуск: `python -m benchmarks.like_statements`.
+Используется база данных из настроек. Скрипт создает посты с 1, 100 и 10000
+лайков и читает первую страницу `GET /likes/{post_id}` каждого поста через
+приложение. Лайки загружаются вместе с авторами одним запросом, поэтому
+количество SQL-запросов не должно зависеть от количества лайков; иначе
+скрипт завершается с ошибкой.
+
+"""
+import asyncio
+import json
+import random
+import sys
+from time import time
+
+from app.core.crud.like import like_crud
+from app.core.db.db import AsyncSessionLocal
+from app.core.db.models import User
+from benchmarks.common import count_statements, create_client, listen_statements
+from benchmarks.seed import seed
+
+LIKE_COUNTS = (1, 100, 10000)
+PAGE_SIZE = 10
+EXPECTED_STATEMENTS = 2
+
+
+async def seed_likes(prefix: str) -> dict[int, int]:
+    """
+    Создает посты и ставит каждому из них заданное количество лайков.
+
+    Возвращает количество лайков по идентификаторам постов.
+
+    - **prefix**: Префикс e-mail и текстов для изоляции запусков.
+
+    """
+    seeded = await seed(
+        max(LIKE_COUNTS), len(LIKE_COUNTS), 0, 1.0, random.Random(0), prefix
+    )
+    likes_by_post = dict(zip(seeded["post_ids"], LIKE_COUNTS))
+    async with AsyncSessionLocal() as session:
+        for index, user_id in enumerate(seeded["user_ids"]):
+            post_ids = [
+                post_id for post_id, likes in likes_by_post.items() if index < likes
+            ]
+            await like_crud.leave_likes(User(id=user_id), post_ids, session)
+    return likes_by_post
+
+
+async def main() -> dict[int, int]:
+    """Считает SQL-запросы чтения первой страницы лайков постов."""
+    likes_by_post = await seed_likes(f"like-statements-{int(time())}")
+    listen_statements()
+    result = {}
+    async with create_client() as client:
+        for post_id, likes in likes_by_post.items():
+            response, result[likes] = await count_statements(
+                client.get(f"/likes/{post_id}", params={"limit": PAGE_SIZE})
+            )
+            response.raise_for_status()
+            assert len(response.json()["items"]) == min(likes, PAGE_SIZE)
+    return result
+
+
+if __name__ == "__main__":
+    result = asyncio.run(main())
+    print(json.dumps({"statements": result, "expected": EXPECTED_STATEMENTS}))
+    sys.exit(any(count != EXPECTED_STATEMENTS for count in result.values()))
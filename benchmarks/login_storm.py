@@ -0,0 +1,94 @@
+"""
+Задержка чтения ленты во время шквала входов в систему.
+
+Запуск: `python -m benchmarks.login_storm [--url http://localhost:8000]`.
+Без `--url` приложение вызывается внутри процесса через ASGI,
+используя базу данных из настроек.
+
+"""
+import argparse
+import asyncio
+import json
+from time import perf_counter
+
+import httpx
+
+from benchmarks.common import create_client, login, summarize
+
+EMAIL = "login-storm@example.com"
+PASSWORD = "login-storm-password"
+
+
+async def read_feed(
+    client: httpx.AsyncClient, stop: asyncio.Event, latencies: list[float]
+) -> None:
+    """Читает ленту, пока не будет остановлен, и записывает задержки."""
+    while not stop.is_set():
+        started_at = perf_counter()
+        await client.get("/posts/")
+        latencies.append(perf_counter() - started_at)
+
+
+async def log_in_repeatedly(
+    client: httpx.AsyncClient, stop: asyncio.Event, latencies: list[float]
+) -> None:
+    """Входит в систему, пока не будет остановлен, и записывает задержки."""
+    while not stop.is_set():
+        started_at = perf_counter()
+        await client.post(
+            "/auth/jwt/login", data={"username": EMAIL, "password": PASSWORD}
+        )
+        latencies.append(perf_counter() - started_at)
+
+
+async def run_phase(
+    client: httpx.AsyncClient, readers: int, logins: int, duration: float
+) -> dict:
+    """
+    Запускает читателей ленты и входящих пользователей на заданное время.
+
+    - **client**: Клиент к приложению.
+    - **readers**: Количество параллельных читателей ленты.
+    - **logins**: Количество параллельных входов в систему.
+    - **duration**: Длительность замера в секундах.
+
+    """
+    stop = asyncio.Event()
+    feed_latencies, login_latencies = [], []
+    tasks = [
+        asyncio.create_task(read_feed(client, stop, feed_latencies))
+        for _ in range(readers)
+    ] + [
+        asyncio.create_task(log_in_repeatedly(client, stop, login_latencies))
+        for _ in range(logins)
+    ]
+    await asyncio.sleep(duration)
+    stop.set()
+    await asyncio.gather(*tasks)
+    return {
+        "feed": summarize(feed_latencies, duration),
+        "login": summarize(login_latencies, duration),
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Замеряет ленту без нагрузки и во время шквала входов."""
+    async with create_client(args.url) as client:
+        await login(client, EMAIL, PASSWORD)
+        client.cookies.clear()
+        result = {
+            "baseline": await run_phase(client, args.readers, 0, args.duration),
+            "login_storm": await run_phase(
+                client, args.readers, args.logins, args.duration
+            ),
+        }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", help="Адрес запущенного сервера.")
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--logins", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,69 @@
+"""
+Загрузка страницы ленты объектами моделей против выборки только нужных колонок.
+
+Запуск: `python -m benchmarks.projection [--posts 1000] [--repeat 10]`.
+Посты создаются в базе данных из настроек.
+
+"""
+import argparse
+import asyncio
+import json
+import random
+import tracemalloc
+from time import perf_counter, time
+from typing import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.crud.post import post_crud
+from app.core.db.db import AsyncSessionLocal
+from benchmarks.seed import seed
+
+
+async def measure(
+    load: Callable[[AsyncSession], Awaitable[list]], repeat: int
+) -> dict[str, float]:
+    """
+    Возвращает среднее время загрузки страницы и пик выделенной памяти.
+
+    - **load**: Функция загрузки страницы в сессии.
+    - **repeat**: Количество повторов.
+
+    """
+    elapsed, peak = 0.0, 0
+    for _ in range(repeat):
+        async with AsyncSessionLocal() as session:
+            tracemalloc.start()
+            started_at = perf_counter()
+            await load(session)
+            elapsed += perf_counter() - started_at
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+    return {
+        "ms": round(elapsed / repeat * 1000, 2),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Наполняет базу данных и сравнивает оба способа загрузки страницы."""
+    await seed(50, args.posts, 0, 1.0, random.Random(0), f"projection-{int(time())}")
+    result = {
+        "posts": args.posts,
+        "orm": await measure(
+            lambda session: post_crud.get_all_posts(args.posts, 0, session),
+            args.repeat,
+        ),
+        "projection": await measure(
+            lambda session: post_crud.get_all_post_rows(args.posts, 0, session),
+            args.repeat,
+        ),
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=10)
+    asyncio.run(main(parser.parse_args()))
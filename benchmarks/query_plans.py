@@ -0,0 +1,296 @@
+"""
+Проверка планов горячих запросов CRUD-слоя.
+
+Запуск:
+`python -m benchmarks.query_plans [--users 100] [--posts 10000] [--likes 20000]`.
+Используется база данных PostgreSQL из настроек. Скрипт наполняет базу данных,
+выполняет операции post_crud, like_crud, follow_crud и обработчика фоновых задач,
+записывает выполненные ими SQL-запросы и строит для каждого план EXPLAIN.
+Если запрос читает последовательным сканированием таблицу, в которой не меньше
+`--min-rows` строк, или у внешнего ключа нет индекса, начинающегося с его колонок
+(иначе каскадное удаление и проверка ключа сканируют таблицу целиком), скрипт
+завершается с ошибкой.
+
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+from contextvars import ContextVar
+from time import time
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy import MetaData, PrimaryKeyConstraint, UniqueConstraint, event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.crud.follow import follow_crud
+from app.core.crud.like import like_crud
+from app.core.crud.post import post_crud
+from app.core.db.db import AsyncSessionLocal, engine
+from app.core.db.models import Base, User
+from app.core.jobs import job_worker
+from app.schemas.post import PostCreate, PostUpdate
+from benchmarks.seed import seed
+
+captured: ContextVar[Optional[list[tuple[str, Any]]]] = ContextVar(
+    "captured", default=None
+)
+
+
+def capture_statement(conn, cursor, statement, parameters, context, executemany):
+    """Запоминает SQL-запрос текущей задачи, если запись включена."""
+    statements = captured.get()
+    if statements is not None:
+        statements.append((statement, parameters))
+
+
+async def capture(operation: Awaitable) -> list[tuple[str, Any]]:
+    """
+    Выполняет операцию и возвращает выполненные ею SQL-запросы с параметрами.
+
+    - **operation**: Выполняемая операция.
+
+    """
+    statements = []
+    token = captured.set(statements)
+    try:
+        await operation
+    finally:
+        captured.reset(token)
+    return statements
+
+
+def find_seq_scans(plan: dict[str, Any], large_tables: set[str]) -> list[str]:
+    """
+    Возвращает большие таблицы, которые план читает последовательным сканированием.
+
+    - **plan**: Узел плана EXPLAIN (FORMAT JSON).
+    - **large_tables**: Таблицы, последовательное сканирование которых недопустимо.
+
+    """
+    tables = []
+    if plan["Node Type"] == "Seq Scan" and plan["Relation Name"] in large_tables:
+        tables.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        tables += find_seq_scans(child, large_tables)
+    return tables
+
+
+def find_unindexed_foreign_keys(metadata: MetaData) -> list[str]:
+    """
+    Возвращает внешние ключи, для которых нет индекса, начинающегося с их колонок.
+
+    Частичные индексы не учитываются: они покрывают не все строки.
+
+    - **metadata**: Метаданные моделей.
+
+    """
+    unindexed = []
+    for table in metadata.sorted_tables:
+        indexed = [
+            [column.name for column in index.columns]
+            for index in table.indexes
+            if index.dialect_options["postgresql"]["where"] is None
+        ] + [
+            [column.name for column in constraint.columns]
+            for constraint in table.constraints
+            if isinstance(constraint, (PrimaryKeyConstraint, UniqueConstraint))
+        ]
+        for foreign_key in table.foreign_key_constraints:
+            columns = [column.name for column in foreign_key.columns]
+            if not any(index[: len(columns)] == columns for index in indexed):
+                unindexed.append(f"{table.name}({', '.join(columns)})")
+    return unindexed
+
+
+async def explain(statement: str, parameters: Any) -> dict[str, Any]:
+    """
+    Строит план запроса без его выполнения.
+
+    - **statement**: SQL-запрос в формате драйвера.
+    - **parameters**: Параметры запроса.
+
+    """
+    async with engine.connect() as connection:
+        result = await connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {statement}", parameters
+        )
+        plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+async def get_large_tables(min_rows: int) -> set[str]:
+    """
+    Приводит таблицы в состояние после работы autovacuum и возвращает таблицы,
+    в которых не меньше `min_rows` строк.
+
+    VACUUM ANALYZE обновляет статистику и переносит только что вставленные
+    строки из очереди GIN-индексов в сами индексы: иначе планировщик считает
+    поиск по индексу дороже последовательного сканирования.
+
+    - **min_rows**: Минимальное количество строк большой таблицы.
+
+    """
+    tables = set()
+    async with engine.connect() as connection:
+        connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        for table in Base.metadata.sorted_tables:
+            await connection.exec_driver_sql(f"VACUUM ANALYZE {table.name}")
+            rows = await connection.exec_driver_sql(
+                f"SELECT count(*) FROM {table.name}"
+            )
+            if rows.scalar() >= min_rows:
+                tables.add(table.name)
+    return tables
+
+
+def get_operations(
+    user_ids: list[int], post_ids: list[int], prefix: str
+) -> dict[str, Callable[[AsyncSession], Awaitable]]:
+    """
+    Возвращает проверяемые операции CRUD-слоя по их именам.
+
+    Операции выполняются по порядку: записи создают объекты для следующих операций.
+
+    - **user_ids**: Идентификаторы пользователей из наполненной базы данных.
+    - **post_ids**: Идентификаторы постов из наполненной базы данных.
+    - **prefix**: Префикс текстов создаваемых постов.
+
+    """
+    reader, author = User(id=user_ids[0]), User(id=user_ids[-1])
+    post_id, posts = post_ids[len(post_ids) // 2], {}
+
+    async def create_post(session: AsyncSession):
+        posts["new"] = await post_crud.create(
+            PostCreate(text=f"{prefix} query plans"), session, author
+        )
+
+    async def delete_post(session: AsyncSession):
+        post = await post_crud.get(posts["new"].id, session)
+        await post_crud.delete(post, session)
+
+    async def get_second_page(session: AsyncSession):
+        rows = await post_crud.get_all_post_rows(10, 0, session)
+        await post_crud.get_all_post_rows(
+            10, 0, session, (rows[-1].created_at, rows[-1].id)
+        )
+
+    return {
+        "post_crud.get": lambda session: post_crud.get(post_id, session),
+        "post_crud.get_post_with_author_by_id": (
+            lambda session: post_crud.get_post_with_author_by_id(post_id, session)
+        ),
+        "post_crud.get_post_by_text": (
+            lambda session: post_crud.get_post_by_text(f"{prefix} post 0", session)
+        ),
+        "post_crud.get_post_authors": (
+            lambda session: post_crud.get_post_authors(post_ids[:100], session)
+        ),
+        "post_crud.get_all_posts": (
+            lambda session: post_crud.get_all_posts(10, 0, session)
+        ),
+        "post_crud.get_all_post_rows": get_second_page,
+        "post_crud.get_trending_rows": (
+            lambda session: post_crud.get_trending_rows(10, session)
+        ),
+        "post_crud.search_post_rows": (
+            lambda session: post_crud.search_post_rows("post 42", 10, session)
+        ),
+        "post_crud.get_timeline_rows": (
+            lambda session: post_crud.get_timeline_rows(reader.id, 10, session)
+        ),
+        "post_crud.create": create_post,
+        "job_worker.run_pending": lambda session: job_worker.run_pending(),
+        "post_crud.fan_out": (
+            lambda session: post_crud.fan_out([posts["new"].id], session)
+        ),
+        "post_crud.update": lambda session: post_crud.update(
+            posts["new"], PostUpdate(text=f"{prefix} query plans edited"), session
+        ),
+        "like_crud.get_post_likes": (
+            lambda session: like_crud.get_post_likes(post_id, 10, session)
+        ),
+        "like_crud.get_liked_post_ids": (
+            lambda session: like_crud.get_liked_post_ids(
+                reader.id, post_ids[:100], session
+            )
+        ),
+        "like_crud.leave_like": (
+            lambda session: like_crud.leave_like(reader, posts["new"].id, session)
+        ),
+        "like_crud.delete_like": (
+            lambda session: like_crud.delete_like(reader, posts["new"].id, session)
+        ),
+        "like_crud.leave_likes": (
+            lambda session: like_crud.leave_likes(reader, post_ids[-100:], session)
+        ),
+        "follow_crud.follow": (
+            lambda session: follow_crud.follow(reader, author.id, session)
+        ),
+        "follow_crud.unfollow": (
+            lambda session: follow_crud.unfollow(reader, author.id, session)
+        ),
+        "post_crud.delete": delete_post,
+    }
+
+
+async def follow_authors(user_ids: list[int], follows: int, rng: random.Random):
+    """
+    Подписывает каждого пользователя на случайных авторов.
+
+    - **user_ids**: Идентификаторы пользователей.
+    - **follows**: Количество подписок каждого пользователя.
+    - **rng**: Генератор случайных чисел.
+
+    """
+    async with AsyncSessionLocal() as session:
+        for user_id in user_ids:
+            for author_id in rng.sample(user_ids, min(follows, len(user_ids))):
+                if author_id != user_id:
+                    await follow_crud.follow(User(id=user_id), author_id, session)
+
+
+async def main(args: argparse.Namespace) -> dict[str, Any]:
+    """Наполняет базу данных и проверяет планы запросов всех операций."""
+    rng = random.Random(args.seed)
+    prefix = f"query-plans-{int(time())}"
+    seeded = await seed(args.users, args.posts, args.likes, 1.1, rng, prefix)
+    await follow_authors(seeded["user_ids"], args.follows, rng)
+    large_tables = await get_large_tables(args.min_rows)
+    event.listen(engine.sync_engine, "before_cursor_execute", capture_statement)
+    operations = {}
+    async with AsyncSessionLocal() as session:
+        for name, operation in get_operations(
+            seeded["user_ids"], seeded["post_ids"], prefix
+        ).items():
+            statements = await capture(operation(session))
+            seq_scans = []
+            for statement, parameters in statements:
+                plan = await explain(statement, parameters)
+                seq_scans += find_seq_scans(plan, large_tables)
+            operations[name] = {"statements": len(statements), "seq_scans": seq_scans}
+    event.remove(engine.sync_engine, "before_cursor_execute", capture_statement)
+    return {
+        "large_tables": sorted(large_tables),
+        "operations": operations,
+        "unindexed_foreign_keys": find_unindexed_foreign_keys(Base.metadata),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--posts", type=int, default=10000)
+    parser.add_argument("--likes", type=int, default=20000)
+    parser.add_argument("--follows", type=int, default=10)
+    parser.add_argument("--min-rows", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    result = asyncio.run(main(parser.parse_args()))
+    print(json.dumps(result, indent=2))
+    sys.exit(
+        bool(result["unindexed_foreign_keys"])
+        or any(operation["seq_scans"] for operation in result["operations"].values())
+    )
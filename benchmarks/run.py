@@ -0,0 +1,264 @@
+"""
+Нагрузочный тест основных эндпоинтов со смешанной нагрузкой.
+
+Запуск: `python -m benchmarks.run [--url http://localhost:8000] [--output result.json]`.
+База данных из настроек наполняется через CRUD-слой, после чего приложение
+вызывается внутри процесса через ASGI или через запущенный сервер.
+Количество SQL-запросов на запрос считается только внутри процесса.
+Внутри процесса отчет также сравнивает `POST /likes/{post_id}` с загрузкой
+пользователя из базы данных и с доверием данным токена
+(AUTH_TRUST_TOKEN_CLAIMS): `--auth-requests` последовательных лайков в каждом
+режиме, режим переключается подменой зависимости current_user.
+
+"""
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+from statistics import mean
+from time import perf_counter, time
+from typing import Any, Callable, Optional
+
+import httpx
+
+from app.core import user as auth
+from app.main import app
+from benchmarks.common import create_client, listen_statements, statements, summarize
+from benchmarks.seed import PASSWORD, seed, zipf_weights
+
+AUTH_MODES = {
+    "database": auth.fastapi_users.current_user(active=True),
+    "token_claims": auth.get_user_from_token_claims,
+}
+
+
+class Workload:
+    """Состояние нагрузки, общее для всех виртуальных пользователей."""
+
+    def __init__(
+        self,
+        reader: httpx.AsyncClient,
+        writer: httpx.AsyncClient,
+        headers: list[dict],
+        post_ids: list[int],
+        exponent: float,
+        rng: random.Random,
+    ):
+        """
+        Создает нагрузку.
+
+        - **reader**: Клиент для анонимных чтений.
+        - **writer**: Клиент для записей от имени пользователей.
+        - **headers**: Заголовки авторизации пользователей.
+        - **post_ids**: Идентификаторы постов.
+        - **exponent**: Показатель распределения Ципфа для выбора постов.
+        - **rng**: Генератор случайных чисел.
+
+        """
+        self.reader = reader
+        self.writer = writer
+        self.headers = headers
+        self.post_ids = post_ids
+        self.weights = zipf_weights(len(post_ids), exponent)
+        self.rng = rng
+        self.next_cursor: Optional[str] = None
+
+    def hot_post_id(self) -> int:
+        """Выбирает пост по распределению Ципфа."""
+        return self.rng.choices(self.post_ids, weights=self.weights)[0]
+
+    async def feed(self) -> httpx.Response:
+        """Читает первую или следующую страницу ленты."""
+        params = {"limit": 20}
+        if self.next_cursor is not None and self.rng.random() < 0.5:
+            params["cursor"] = self.next_cursor
+        response = await self.reader.get("/posts/", params=params)
+        if response.status_code == 200:
+            self.next_cursor = response.json()["next_cursor"]
+        return response
+
+    async def detail(self) -> httpx.Response:
+        """Читает популярный пост."""
+        return await self.reader.get(f"/posts/{self.hot_post_id()}")
+
+    async def likes(self) -> httpx.Response:
+        """Читает лайки популярного поста."""
+        return await self.reader.get(f"/likes/{self.hot_post_id()}")
+
+    async def like(self) -> httpx.Response:
+        """Ставит лайк на популярный пост или снимает уже поставленный."""
+        post_id, headers = self.hot_post_id(), self.rng.choice(self.headers)
+        response = await self.writer.post(f"/likes/{post_id}", headers=headers)
+        if response.status_code == 400:
+            response = await self.writer.delete(f"/likes/{post_id}", headers=headers)
+        return response
+
+    async def create(self) -> httpx.Response:
+        """Создает пост со случайным текстом."""
+        return await self.writer.post(
+            "/posts/",
+            json={"text": f"benchmark {self.rng.getrandbits(64):x}"},
+            headers=self.rng.choice(self.headers),
+        )
+
+
+def parse_mix(mix: str) -> dict[str, int]:
+    """Разбирает веса операций вида `feed=60,detail=25`."""
+    return {
+        name: int(weight)
+        for name, weight in (item.split("=") for item in mix.split(","))
+    }
+
+
+async def virtual_user(
+    operations: dict[str, Callable],
+    weights: dict[str, int],
+    rng: random.Random,
+    deadline: float,
+    results: dict[str, dict[str, list]],
+) -> None:
+    """Выполняет случайные операции до окончания замера."""
+    names, name_weights = list(weights), list(weights.values())
+    while perf_counter() < deadline:
+        name = rng.choices(names, weights=name_weights)[0]
+        counter = [0]
+        statements.set(counter)
+        started_at = perf_counter()
+        response = await operations[name]()
+        results[name]["latencies"].append(perf_counter() - started_at)
+        results[name]["statements"].append(counter[0])
+        if response.status_code >= 500:
+            results[name]["errors"].append(response.status_code)
+
+
+async def measure_like_auth(
+    workload: Workload, requests: int
+) -> dict[str, dict[str, Any]]:
+    """
+    Замеряет `POST /likes/{post_id}` в каждом режиме проверки токена.
+
+    Перед замером лайк снимается, чтобы запрос снова создавал лайк.
+    Отказ на собственный пост пользователя в замер не попадает.
+
+    - **workload**: Нагрузка с клиентом для записей и пользователями.
+    - **requests**: Количество лайков в каждом режиме.
+
+    """
+    report = {}
+    for mode, dependency in AUTH_MODES.items():
+        app.dependency_overrides[auth.current_user] = dependency
+        latencies, counts = [], []
+        try:
+            while len(latencies) < requests:
+                post_id = workload.rng.choice(workload.post_ids)
+                headers = workload.rng.choice(workload.headers)
+                await workload.writer.delete(f"/likes/{post_id}", headers=headers)
+                counter = [0]
+                statements.set(counter)
+                started_at = perf_counter()
+                response = await workload.writer.post(
+                    f"/likes/{post_id}", headers=headers
+                )
+                elapsed = perf_counter() - started_at
+                statements.set(None)
+                if response.status_code == 400:
+                    continue
+                response.raise_for_status()
+                latencies.append(elapsed)
+                counts.append(counter[0])
+        finally:
+            del app.dependency_overrides[auth.current_user]
+        report[mode] = {
+            **summarize(latencies, sum(latencies)),
+            "sql_per_request": round(mean(counts), 2),
+        }
+    return report
+
+
+def get_commit() -> Optional[str]:
+    """Возвращает текущий коммит git, если он доступен."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main(args: argparse.Namespace) -> dict[str, Any]:
+    """Наполняет базу данных, запускает нагрузку и возвращает отчет."""
+    rng = random.Random(args.seed)
+    seeded = await seed(
+        args.users, args.posts, args.likes, args.zipf, rng, f"bench-{int(time())}"
+    )
+    if args.url is None:
+        listen_statements()
+    weights = parse_mix(args.mix)
+    async with create_client(args.url) as reader, create_client(args.url) as writer:
+        headers = []
+        for email in seeded["emails"][: args.logged_in]:
+            response = await writer.post(
+                "/auth/jwt/login", data={"username": email, "password": PASSWORD}
+            )
+            response.raise_for_status()
+            token = response.json()["access_token"]
+            headers.append({"Authorization": f"Bearer {token}"})
+        workload = Workload(reader, writer, headers, seeded["post_ids"], args.zipf, rng)
+        operations = {name: getattr(workload, name) for name in weights}
+        results = {
+            name: {"latencies": [], "statements": [], "errors": []} for name in weights
+        }
+        deadline = perf_counter() + args.duration
+        await asyncio.gather(
+            *(
+                virtual_user(
+                    operations, weights, random.Random(rng.random()), deadline, results
+                )
+                for _ in range(args.concurrency)
+            )
+        )
+        like_auth = None
+        if args.url is None and args.auth_requests > 0:
+            like_auth = await measure_like_auth(workload, args.auth_requests)
+    report = {
+        "commit": get_commit(),
+        "config": vars(args),
+        "seeded_likes": seeded["likes"],
+        "total": summarize(
+            [value for result in results.values() for value in result["latencies"]],
+            args.duration,
+        ),
+        "operations": {},
+    }
+    for name, result in results.items():
+        summary = summarize(result["latencies"], args.duration)
+        summary["errors"] = len(result["errors"])
+        if args.url is None and result["statements"]:
+            summary["sql_per_request"] = round(mean(result["statements"]), 2)
+        report["operations"][name] = summary
+    if like_auth is not None:
+        report["like_auth"] = like_auth
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", help="Адрес запущенного сервера.")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--likes", type=int, default=5000)
+    parser.add_argument("--zipf", type=float, default=1.1)
+    parser.add_argument("--logged-in", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--mix", default="feed=50,detail=25,likes=10,like=10,create=5")
+    parser.add_argument("--auth-requests", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Файл для сохранения отчета в JSON.")
+    args = parser.parse_args()
+    report = asyncio.run(main(args))
+    print(json.dumps(report, indent=2))
+    if args.output is not None:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
@@ -0,0 +1,94 @@
+import random
+from collections import defaultdict
+from typing import Any
+
+from pydantic import BaseModel
+
+from app.core.crud.like import like_crud
+from app.core.crud.post import post_crud
+from app.core.crud.user import user_crud
+from app.core.db.db import AsyncSessionLocal
+from app.core.db.models import User
+from app.core.password import password_hasher
+from app.schemas.post import PostCreate
+
+PASSWORD = "benchmark-password"
+
+
+class UserSeed(BaseModel):
+    """Схема для создания пользователя бенчмарка в обход регистрации."""
+
+    email: str
+    hashed_password: str
+
+
+def zipf_weights(size: int, exponent: float) -> list[float]:
+    """
+    Возвращает веса распределения Ципфа: k-й элемент в k^s раз реже первого.
+
+    - **size**: Количество элементов.
+    - **exponent**: Показатель распределения.
+
+    """
+    return [1 / rank**exponent for rank in range(1, size + 1)]
+
+
+async def seed(
+    users: int,
+    posts: int,
+    likes: int,
+    exponent: float,
+    rng: random.Random,
+    prefix: str,
+) -> dict[str, Any]:
+    """
+    Наполняет базу данных пачками через CRUD-слой приложения.
+
+    Авторы постов выбираются равномерно, а посты для лайков - по распределению
+    Ципфа, чтобы небольшое количество постов собирало большинство лайков.
+
+    - **users**: Количество пользователей.
+    - **posts**: Количество постов.
+    - **likes**: Количество попыток поставить лайк.
+    - **exponent**: Показатель распределения Ципфа.
+    - **rng**: Генератор случайных чисел.
+    - **prefix**: Префикс e-mail и текстов для изоляции запусков.
+
+    """
+    hashed_password = await password_hasher.hash(PASSWORD)
+    emails = [f"{prefix}-user-{index}@example.com" for index in range(users)]
+    authors, post_ids, left_likes = [], [], 0
+    async with AsyncSessionLocal() as session:
+        for email in emails:
+            user = await user_crud.create(
+                UserSeed(email=email, hashed_password=hashed_password), session
+            )
+            authors.append(User(id=user.id))
+        posts_by_author = defaultdict(list)
+        for index in range(posts):
+            posts_by_author[rng.randrange(users)].append(
+                PostCreate(text=f"{prefix} post {index}")
+            )
+        for author_index, posts_in in posts_by_author.items():
+            post_ids += await post_crud.create_posts(
+                posts_in, session, authors[author_index]
+            )
+        liked_post_ids = []
+        if post_ids:
+            liked_post_ids = rng.choices(
+                post_ids, weights=zipf_weights(len(post_ids), exponent), k=likes
+            )
+        likes_by_author = defaultdict(list)
+        for post_id in liked_post_ids:
+            likes_by_author[rng.randrange(users)].append(post_id)
+        for author_index, author_post_ids in likes_by_author.items():
+            new_likes = await like_crud.leave_likes(
+                authors[author_index], author_post_ids, session
+            )
+            left_likes += len(new_likes)
+    return {
+        "emails": emails,
+        "user_ids": [author.id for author in authors],
+        "post_ids": post_ids,
+        "likes": left_likes,
+    }
@@ -0,0 +1,97 @@
+"""
+Сериализация страницы ленты: схемы pydantic против словарей из колонок и orjson.
+
+Запуск: `python -m benchmarks.serialization [--items 100] [--repeat 200]`.
+База данных не нужна: страница собирается из объектов моделей в памяти.
+
+"""
+import argparse
+import json
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import Callable
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.db.models import Post, User
+from app.core.serialization import render_response, serialize_post_detail
+from app.schemas.post import PostDetailPage
+
+
+def make_posts(items: int) -> list[Post]:
+    """
+    Создает посты с авторами, не сохраняя их в базу данных.
+
+    - **items**: Количество постов.
+
+    """
+    now = datetime.now()
+    authors = [
+        User(
+            id=index,
+            email=f"user-{index}@example.com",
+            is_active=True,
+            is_superuser=False,
+            is_verified=False,
+        )
+        for index in range(10)
+    ]
+    return [
+        Post(
+            id=index,
+            text=f"Текст поста {index} " * 10,
+            created_at=now - timedelta(minutes=index),
+            author=authors[index % len(authors)],
+            likes_count=index,
+        )
+        for index in range(items)
+    ]
+
+
+def render_pydantic(posts: list[Post]) -> Response:
+    """Сериализует страницу через схемы pydantic и jsonable_encoder."""
+    return JSONResponse(
+        jsonable_encoder(PostDetailPage(items=posts, next_cursor="cursor"))
+    )
+
+
+def render_fast(posts: list[Post]) -> Response:
+    """Сериализует страницу словарями из колонок и orjson."""
+    return render_response(
+        {
+            "items": [serialize_post_detail(post) for post in posts],
+            "next_cursor": "cursor",
+        }
+    )
+
+
+def measure(render: Callable[[list[Post]], Response], posts: list, repeat: int):
+    """Возвращает среднее время сериализации страницы в миллисекундах."""
+    started_at = perf_counter()
+    for _ in range(repeat):
+        render(posts)
+    return round((perf_counter() - started_at) / repeat * 1000, 3)
+
+
+def main(args: argparse.Namespace) -> None:
+    """Сравнивает оба способа сериализации и проверяет совпадение ответов."""
+    posts = make_posts(args.items)
+    assert render_pydantic(posts).body == render_fast(posts).body
+    pydantic_ms = measure(render_pydantic, posts, args.repeat)
+    fast_ms = measure(render_fast, posts, args.repeat)
+    result = {
+        "items": args.items,
+        "pydantic_ms": pydantic_ms,
+        "fast_ms": fast_ms,
+        "speedup": round(pydantic_ms / fast_ms, 1),
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    main(parser.parse_args())
@@ -0,0 +1,199 @@
+"""
+Персональная лента при степенном распределении подписчиков.
+
+Запуск: `python -m benchmarks.timeline [--users 300] [--follows 20] [--posts 2000]`.
+Используется база данных из настроек. Количество подписчиков у авторов
+распределено по Ципфу, количество подписок у читателей - равномерно
+от 1 до 2 * `--follows`. Кроме того, `--wide-readers` читателей подписываются
+на всех пользователей и еще на `--wide-follows` отдельных авторов, чтобы
+проверить, что чтение ленты не зависит от количества подписок. Отчет
+показывает задержку публикации поста и фоновой рассылки для обычных
+и популярных авторов и задержку чтения страницы ленты по количеству подписок.
+
+"""
+import argparse
+import asyncio
+import json
+import random
+from collections import defaultdict
+from time import perf_counter, time
+
+from app.core.config import settings
+from app.core.crud.follow import follow_crud
+from app.core.crud.post import post_crud
+from app.core.db.db import AsyncSessionLocal
+from app.core.db.models import User
+from app.core.jobs import job_worker
+from app.schemas.post import PostCreate
+from benchmarks.common import listen_statements, statements, summarize
+from benchmarks.seed import seed, zipf_weights
+
+FOLLOWS_BUCKETS = [
+    (bound, f"follows<={bound}") for bound in (5, 10, 20, 50, 100, 1000, 10000)
+]
+FOLLOWS_OVERFLOW_BUCKET = "follows>10000"
+
+
+async def follow_authors(
+    user_ids: list[int], follows: int, exponent: float, rng: random.Random
+) -> tuple[dict[int, int], dict[int, int]]:
+    """
+    Подписывает пользователей на авторов, выбранных по распределению Ципфа.
+
+    Возвращает количество подписчиков и подписок каждого пользователя.
+
+    - **user_ids**: Идентификаторы пользователей.
+    - **follows**: Среднее количество подписок пользователя.
+    - **exponent**: Показатель распределения Ципфа.
+    - **rng**: Генератор случайных чисел.
+
+    """
+    weights = zipf_weights(len(user_ids), exponent)
+    followers, following = defaultdict(int), defaultdict(int)
+    async with AsyncSessionLocal() as session:
+        for user_id in user_ids:
+            author_ids = set(
+                rng.choices(user_ids, weights=weights, k=rng.randint(1, 2 * follows))
+            )
+            for author_id in author_ids - {user_id}:
+                await follow_crud.follow(User(id=user_id), author_id, session)
+                followers[author_id] += 1
+                following[user_id] += 1
+    return followers, following
+
+
+async def follow_widely(
+    reader_ids: list[int],
+    author_ids: list[int],
+    followers: dict[int, int],
+    following: dict[int, int],
+) -> None:
+    """
+    Подписывает каждого читателя на всех авторов.
+
+    - **reader_ids**: Идентификаторы читателей.
+    - **author_ids**: Идентификаторы авторов.
+    - **followers**: Количество подписчиков каждого пользователя; обновляется.
+    - **following**: Количество подписок каждого пользователя; обновляется.
+
+    """
+    async with AsyncSessionLocal() as session:
+        for reader_id in reader_ids:
+            for author_id in author_ids:
+                await follow_crud.follow(User(id=reader_id), author_id, session)
+                followers[author_id] += 1
+                following[reader_id] += 1
+
+
+async def publish_posts(
+    user_ids: list[int], followers: dict[int, int], posts: int, prefix: str
+) -> dict:
+    """
+    Публикует посты случайных авторов и замеряет запись и фоновую рассылку.
+
+    - **user_ids**: Идентификаторы пользователей.
+    - **followers**: Количество подписчиков каждого автора.
+    - **posts**: Количество постов.
+    - **prefix**: Префикс текстов постов.
+
+    """
+    latencies = defaultdict(list)
+    rng = random.Random(posts)
+    async with AsyncSessionLocal() as session:
+        for index in range(posts):
+            author_id = rng.choice(user_ids)
+            started_at = perf_counter()
+            await post_crud.create(
+                PostCreate(text=f"{prefix} post {index}"), session, User(id=author_id)
+            )
+            created_at = perf_counter()
+            await job_worker.run_pending()
+            kind = (
+                "popular_author"
+                if followers[author_id] > settings.FEED_FANOUT_MAX_FOLLOWERS
+                else "regular_author"
+            )
+            latencies[kind].append(created_at - started_at)
+            latencies[f"{kind}_fan_out"].append(perf_counter() - created_at)
+    return {kind: summarize(values, sum(values)) for kind, values in latencies.items()}
+
+
+async def read_timelines(following: dict[int, int], limit: int) -> dict:
+    """
+    Читает первую страницу ленты каждого пользователя.
+
+    - **following**: Количество подписок каждого пользователя.
+    - **limit**: Размер страницы.
+
+    """
+    listen_statements()
+    latencies, counts = defaultdict(list), defaultdict(list)
+    async with AsyncSessionLocal() as session:
+        for user_id, follows in following.items():
+            bucket = next(
+                (label for bound, label in FOLLOWS_BUCKETS if follows <= bound),
+                FOLLOWS_OVERFLOW_BUCKET,
+            )
+            counter = [0]
+            statements.set(counter)
+            started_at = perf_counter()
+            await post_crud.get_timeline_rows(user_id, limit, session)
+            latencies[bucket].append(perf_counter() - started_at)
+            counts[bucket].append(counter[0])
+            statements.set(None)
+    return {
+        bucket: {
+            **summarize(latencies[bucket], sum(latencies[bucket])),
+            "sql_per_request": sum(counts[bucket]) / len(counts[bucket]),
+        }
+        for bucket in [label for _, label in FOLLOWS_BUCKETS]
+        + [FOLLOWS_OVERFLOW_BUCKET]
+        if bucket in latencies
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Наполняет граф подписок, публикует посты и читает ленты."""
+    if args.max_followers is not None:
+        settings.FEED_FANOUT_MAX_FOLLOWERS = args.max_followers
+    rng = random.Random(args.seed)
+    prefix = f"timeline-{int(time())}"
+    seeded = await seed(args.users, 0, 0, args.zipf, rng, prefix)
+    followers, following = await follow_authors(
+        seeded["user_ids"], args.follows, args.zipf, rng
+    )
+    wide = await seed(
+        args.wide_readers + args.wide_follows, 0, 0, args.zipf, rng, f"{prefix}-wide"
+    )
+    await follow_widely(
+        wide["user_ids"][: args.wide_readers],
+        wide["user_ids"][args.wide_readers :] + seeded["user_ids"],
+        followers,
+        following,
+    )
+    result = {
+        "config": vars(args),
+        "max_followers": max(followers.values()),
+        "fanout_max_followers": settings.FEED_FANOUT_MAX_FOLLOWERS,
+        "write": await publish_posts(seeded["user_ids"], followers, args.posts, prefix),
+        "read": await read_timelines(following, args.limit),
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=300)
+    parser.add_argument("--follows", type=int, default=20)
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--wide-readers", type=int, default=3)
+    parser.add_argument("--wide-follows", type=int, default=3000)
+    parser.add_argument("--zipf", type=float, default=1.1)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument(
+        "--max-followers",
+        type=int,
+        help="Порог рассылки постов (по умолчанию FEED_FANOUT_MAX_FOLLOWERS).",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,46 @@
+"""
+Проверка количества SQL-запросов в операциях записи CRUD-слоя.
+
+Запуск: `python -m benchmarks.write_statements`.
+Используется база данных из настроек; если операция выполняет больше
+запросов, чем ожидается, скрипт завершается с ошибкой. Создание поста
+записывает в той же транзакции задачу рассылки в outbox.
+
+"""
+import asyncio
+import json
+import random
+import sys
+from time import time
+
+from app.core.crud.post import post_crud
+from app.core.db.db import AsyncSessionLocal
+from app.core.db.models import User
+from app.schemas.post import PostCreate, PostUpdate
+from benchmarks.common import count_statements, listen_statements
+from benchmarks.seed import seed
+
+EXPECTED_STATEMENTS = {"create": 2, "update": 1}
+
+
+async def main() -> dict[str, int]:
+    """Считает SQL-запросы при создании и обновлении поста."""
+    prefix = f"write-statements-{int(time())}"
+    seeded = await seed(1, 0, 0, 1.0, random.Random(0), prefix)
+    author = User(id=seeded["user_ids"][0])
+    listen_statements()
+    result = {}
+    async with AsyncSessionLocal() as session:
+        post, result["create"] = await count_statements(
+            post_crud.create(PostCreate(text=f"{prefix} post"), session, author)
+        )
+        _, result["update"] = await count_statements(
+            post_crud.update(post, PostUpdate(text=f"{prefix} edited"), session)
+        )
+    return result
+
+
+if __name__ == "__main__":
+    result = asyncio.run(main())
+    print(json.dumps({"statements": result, "expected": EXPECTED_STATEMENTS}))
+    sys.exit(result != EXPECTED_STATEMENTS)